@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Task
+from .models import Tag, Task, TaskStats
 
 
 @admin.register(Task)
@@ -9,3 +9,17 @@ class TaskAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "user", "completed", "created_at")
     list_filter = ("completed", "created_at")
     search_fields = ("title", "description", "user__email")
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+
+    list_display = ("id", "name")
+    search_fields = ("name",)
+
+
+@admin.register(TaskStats)
+class TaskStatsAdmin(admin.ModelAdmin):
+
+    list_display = ("user", "total", "completed", "estimated_time")
+    search_fields = ("user__email",)
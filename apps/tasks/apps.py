@@ -6,3 +6,14 @@ class TasksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.tasks"
     label = "tasks"
+
+    def ready(self) -> None:
+        from django.db.backends.signals import connection_created
+
+        from config.database import apply_sqlite_pragmas
+        from config.metrics import install_query_recorder
+
+        from . import signals  # noqa: F401
+
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid="config.database.apply_sqlite_pragmas")
+        connection_created.connect(install_query_recorder, dispatch_uid="config.metrics.install_query_recorder")
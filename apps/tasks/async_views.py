@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .cache import get_precondition_response, get_task_scope, set_validators
+from .events import format_event, get_task_event_broker
+from .models import Task
+from .serializers import TaskReadSerializer, TaskSerializer
+from .views import (
+    TaskDetailAPIView,
+    TaskListCreateAPIView,
+    create_task_schema,
+    delete_task_schema,
+    list_tasks_schema,
+    retrieve_task_schema,
+    update_task_schema,
+)
+
+
+class AsyncAPIView(APIView):
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncTaskListCreateAPIView(AsyncAPIView, TaskListCreateAPIView):
+
+    @list_tasks_schema
+    async def get(self, request, *args, **kwargs):
+        # The ETag reads the user's type and the cached task version, both of which may block.
+        etag = await sync_to_async(self.get_list_etag)(request)
+        if etag is None:
+            return Response(await self.aget_page_data(request))
+        not_modified = get_precondition_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        page_cache_ttl = getattr(settings, "TASK_LIST_CACHE_TTL", 0)
+        page_cache_key = f"tasks:page:{etag}"
+        data = await cache.aget(page_cache_key) if page_cache_ttl else None
+        if data is None:
+            data = await self.aget_page_data(request)
+            if page_cache_ttl:
+                await cache.aset(page_cache_key, data, page_cache_ttl)
+        return set_validators(Response(data), etag)
+
+    async def aget_page_data(self, request):
+        fields = TaskReadSerializer.get_requested_fields(request.query_params)
+        queryset = await sync_to_async(self.get_filtered_queryset)(request, fields)
+        paginator = self.get_paginator(request)
+        paginated_tasks = await paginator.apaginate_queryset(queryset, request, view=self)
+        serializer = TaskReadSerializer(paginated_tasks, many=True, fields=fields)
+        return paginator.get_paginated_response(serializer.data).data
+
+    @create_task_schema
+    async def post(self, request, *args, **kwargs):
+        serializer = TaskSerializer(data=request.data)
+        # Validators and permissions may query the database, which is not allowed on the event loop.
+        if not await sync_to_async(serializer.is_valid)():
+            return self.invalid_response(serializer)
+        return self.created_response(await sync_to_async(self.perform_create)(request, serializer))
+
+
+class AsyncTaskDetailAPIView(AsyncAPIView, TaskDetailAPIView):
+
+    async def aget_object(self, task_id: int) -> Task:
+        try:
+            return await Task.objects.with_user_name().aget(id=task_id)
+        except Task.DoesNotExist as exc:
+            raise NotFound(detail="Task not found.") from exc
+
+    @retrieve_task_schema
+    async def get(self, request, task_id: int, *args, **kwargs):
+        fields = TaskReadSerializer.get_requested_fields(request.query_params)
+        row = await TaskReadSerializer.get_values(Task.objects.filter(id=task_id), fields).afirst()
+        if row is None:
+            raise NotFound(detail="Task not found.")
+        return await sync_to_async(self.retrieve_response)(request, row, fields)
+
+    @update_task_schema
+    async def put(self, request, task_id: int, *args, **kwargs):
+        task = await self.aget_object(task_id)
+        await sync_to_async(self.check_object_permissions)(request, task)
+
+        serializer = TaskSerializer(task, data=request.data)
+        if not await sync_to_async(serializer.is_valid)():
+            return self.invalid_response(serializer)
+        return self.updated_response(await sync_to_async(self.perform_update)(serializer))
+
+    @delete_task_schema
+    async def delete(self, request, task_id: int, *args, **kwargs):
+        task = await self.aget_object(task_id)
+        await sync_to_async(self.check_object_permissions)(request, task)
+        await task.adelete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TaskEventsAPIView(AsyncAPIView):
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        tags=["Tasks"],
+        description=(
+            "Server-Sent Events stream of `created`, `updated` and `deleted` task events for the "
+            "authenticated user (all users for admin users). Each event carries the task `id`, "
+            "`user_id` and `updated_at`. A `resync` event means events were dropped and the client "
+            "should catch up through the change feed. Only served by the ASGI server."
+        ),
+        responses={(200, "text/event-stream"): str, 501: None},
+    )
+    async def get(self, request, *args, **kwargs):
+        if not isinstance(request._request, ASGIRequest):
+            return Response(
+                {"message": "Task events are only served by the ASGI server."},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        response = StreamingHttpResponse(self.stream(get_task_scope(request.user)), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, scope):
+        heartbeat = getattr(settings, "TASK_EVENTS_HEARTBEAT_SECONDS", 15)
+        # Subscribed on the first read, so a client gone before streaming starts never leaves a subscription.
+        subscription = get_task_event_broker().subscribe(scope)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_event(event)
+        finally:
+            subscription.close()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections.abc import Iterable
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+GLOBAL_SCOPE = "all"
+
+
+def _version_key(scope) -> str:
+    return f"tasks:version:{scope}"
+
+
+def get_task_scope(user) -> int | None:
+    if user.has_global_data_access():
+        return None
+    return user.id
+
+
+def get_task_version(user_id: int | None = None) -> int:
+    key = _version_key(user_id or GLOBAL_SCOPE)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version or 0
+
+
+def bump_task_versions(user_ids: Iterable[int]) -> None:
+    for scope in {*user_ids, GLOBAL_SCOPE}:
+        key = _version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump_task_versions_on_commit(user_ids: Iterable[int]) -> None:
+    # Bumping before commit would let a concurrent reader cache pre-commit data under the new version.
+    transaction.on_commit(partial(bump_task_versions, set(user_ids)))
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.md5(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def set_validators(response, etag: str, last_modified=None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Authorization",))
+    return response
+
+
+def get_precondition_response(request, etag: str, last_modified=None):
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified is not None else None,
+    )
+    if response is None:
+        return None
+    return set_validators(response, etag, last_modified)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from functools import lru_cache, partial
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+class TaskEventSubscription:
+
+    def __init__(self, broker: InMemoryTaskEventBroker, user_id: int | None, max_queued: int):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_queued)
+        self.overflowed = False
+
+    def accepts(self, event: dict) -> bool:
+        return self.user_id is None or event["user_id"] == self.user_id
+
+    def offer(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self) -> dict:
+        if self.overflowed:
+            # Events were dropped; tell the client to catch up through the change feed.
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return {"type": "resync"}
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class BaseTaskEventBroker:
+
+    def publish(self, event: dict) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, user_id: int | None):
+        raise NotImplementedError
+
+
+class InMemoryTaskEventBroker(BaseTaskEventBroker):
+    """Delivers events to subscribers in the current process only."""
+
+    def __init__(self, max_queued: int = 100):
+        self.max_queued = max_queued
+        self.subscriptions: set[TaskEventSubscription] = set()
+
+    def publish(self, event: dict) -> None:
+        # Writes happen on worker threads; hand the event to each subscriber's event loop.
+        for subscription in list(self.subscriptions):
+            if not subscription.accepts(event):
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # The subscriber's event loop is gone (server shutdown); drop the subscription.
+                self.unsubscribe(subscription)
+
+    def subscribe(self, user_id: int | None) -> TaskEventSubscription:
+        subscription = TaskEventSubscription(self, user_id, self.max_queued)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: TaskEventSubscription) -> None:
+        self.subscriptions.discard(subscription)
+
+
+@lru_cache(maxsize=None)
+def get_task_event_broker() -> BaseTaskEventBroker:
+    return import_string(settings.TASK_EVENT_BROKER)()
+
+
+@receiver(setting_changed)
+def reset_task_event_broker(*, setting, **kwargs) -> None:
+    if setting == "TASK_EVENT_BROKER":
+        get_task_event_broker.cache_clear()
+
+
+def publish_task_event(event_type: str, task) -> None:
+    event = {
+        "type": event_type,
+        "id": task.id,
+        "user_id": task.user_id,
+        "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+    }
+    # Built now because a deleted task loses its id; sent only once the write is committed.
+    transaction.on_commit(partial(get_task_event_broker().publish, event))
+
+
+def format_event(event: dict) -> str:
+    data = json.dumps({key: value for key, value in event.items() if key != "type"}, separators=(",", ":"))
+    return f"event: {event['type']}\ndata: {data}\n\n"
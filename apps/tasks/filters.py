@@ -1,12 +1,53 @@
 import django_filters
+from django.db.models import Q
+from django.utils import timezone
 
 from .models import Task
+from .tags import filter_by_tags, parse_tag_names
+
+
+class ChoiceInFilter(django_filters.BaseInFilter, django_filters.ChoiceFilter):
+    pass
 
 
 class TaskFilter(django_filters.FilterSet):
 
     completed = django_filters.BooleanFilter(field_name="completed")
+    is_active = django_filters.BooleanFilter(field_name="is_active")
+    status__in = ChoiceInFilter(field_name="status", choices=Task.StatusChoices.choices)
+    priority__in = ChoiceInFilter(field_name="priority", choices=Task.PriorityChoices.choices)
+    due_date = django_filters.IsoDateTimeFromToRangeFilter(field_name="due_date")
+    created_at = django_filters.IsoDateTimeFromToRangeFilter(field_name="created_at")
+    overdue = django_filters.BooleanFilter(method="filter_overdue")
+    tags = django_filters.CharFilter(method="filter_tags")
+    tags_match = django_filters.ChoiceFilter(
+        choices=(("any", "Any"), ("all", "All")),
+        method="filter_tags_match",
+    )
 
     class Meta:
         model = Task
-        fields = ("completed",)
+        fields = (
+            "completed",
+            "is_active",
+            "status__in",
+            "priority__in",
+            "due_date",
+            "created_at",
+            "overdue",
+            "tags",
+            "tags_match",
+        )
+
+    def filter_overdue(self, queryset, name, value):
+        overdue = Q(due_date__lt=timezone.now(), completed=False)
+        return queryset.filter(overdue) if value else queryset.exclude(overdue)
+
+    def filter_tags(self, queryset, name, value):
+        names = parse_tag_names(value)
+        if not names:
+            return queryset
+        return filter_by_tags(queryset, names, self.form.cleaned_data.get("tags_match") or "any")
+
+    def filter_tags_match(self, queryset, name, value):
+        return queryset
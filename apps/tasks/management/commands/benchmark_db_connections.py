@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+from apps.tasks.models import Task
+
+
+class Command(BaseCommand):
+
+    help = "Compare per-request latency with fresh, persistent and pooled database connections."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        settings_dict = connection.settings_dict
+        original = {key: settings_dict[key] for key in ("CONN_MAX_AGE", "CONN_HEALTH_CHECKS")}
+
+        if "pool" in settings_dict.get("OPTIONS", {}):
+            # Pooled connections are reused regardless of CONN_MAX_AGE; rerun with DB_POOL=False to compare.
+            modes = [("pool", 0, original["CONN_HEALTH_CHECKS"])]
+        else:
+            modes = [("per-request", 0, False), ("persistent", 600, False), ("persistent+health", 600, True)]
+
+        self.stdout.write(f"vendor={connection.vendor} requests={options['requests']}")
+        try:
+            for label, max_age, health_checks in modes:
+                connection.close()
+                settings_dict.update(CONN_MAX_AGE=max_age, CONN_HEALTH_CHECKS=health_checks)
+                timings = self.measure(options["database"], options["requests"])
+                percentiles = statistics.quantiles(timings, n=100)
+                self.stdout.write(
+                    f"{label:>18}: p50={percentiles[49]:.3f} ms p99={percentiles[98]:.3f} ms "
+                    f"mean={statistics.fmean(timings):.3f} ms"
+                )
+        finally:
+            connection.close()
+            settings_dict.update(original)
+
+    def measure(self, database, requests) -> list[float]:
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            request_started.send(sender=self.__class__)
+            list(Task.objects.using(database).order_by().values_list("id", flat=True)[:1])
+            request_finished.send(sender=self.__class__)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
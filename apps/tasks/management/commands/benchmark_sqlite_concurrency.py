@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from config.database import get_pragma_statements
+
+
+READ_SQL = (
+    "SELECT id, title, completed, created_at FROM tasks_task WHERE user_id = ? "
+    "ORDER BY created_at DESC, id ASC LIMIT 10"
+)
+WRITE_SQL = (
+    "INSERT INTO tasks_task (user_id, title, description, completed, priority, status, is_active, "
+    "tags, created_at, updated_at) VALUES (?, ?, '', 0, 'MEDIUM', 'PENDING', 1, '', ?, ?)"
+)
+
+
+class Command(BaseCommand):
+
+    help = "Compare concurrent reads and writes on a copy of the SQLite database with default and tuned pragmas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=4)
+        parser.add_argument("--duration", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("This benchmark only applies to the SQLite database.")
+
+        source = sqlite3.connect(connection.settings_dict["NAME"])
+        profiles = (
+            ("default", ["PRAGMA journal_mode = DELETE"]),
+            ("tuned", get_pragma_statements(settings.SQLITE_PRAGMAS)),
+        )
+        self.stdout.write(
+            f"readers={options['readers']} writers={options['writers']} duration={options['duration']}s"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for label, statements in profiles:
+                path = Path(directory) / f"{label}.sqlite3"
+                target = sqlite3.connect(path)
+                source.backup(target)
+                target.close()
+                reads, writes, locked = self.run_profile(path, statements, options)
+                duration = options["duration"]
+                self.stdout.write(
+                    f"{label:>8}: reads/s={reads / duration:9.1f} writes/s={writes / duration:8.1f} "
+                    f"locked errors={locked}"
+                )
+        source.close()
+
+    def run_profile(self, path, statements, options):
+        counters = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options["duration"]
+
+        def connect():
+            # Same connect timeout (5 s) as Django's SQLite backend.
+            db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            for statement in statements:
+                db.execute(statement)
+            return db
+
+        def run(operation, counter):
+            db = connect()
+            done = locked = 0
+            while time.perf_counter() < deadline:
+                try:
+                    operation(db)
+                    done += 1
+                except sqlite3.OperationalError as exc:
+                    if "locked" not in str(exc) and "busy" not in str(exc):
+                        raise
+                    locked += 1
+            db.close()
+            with lock:
+                counters[counter] += done
+                counters["locked"] += locked
+
+        def read(db):
+            db.execute(READ_SQL, (1,)).fetchall()
+
+        def write(db):
+            now = time.strftime("%Y-%m-%d %H:%M:%S")
+            db.execute(WRITE_SQL, (1, "benchmark write", now, now))
+
+        connect().close()
+        threads = [threading.Thread(target=run, args=(read, "reads")) for _ in range(options["readers"])]
+        threads += [threading.Thread(target=run, args=(write, "writes")) for _ in range(options["writers"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counters["reads"], counters["writes"], counters["locked"]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from apps.tasks.models import Task
+from apps.tasks.search import get_search_backend, search_tasks
+
+
+STEMS = (
+    "report", "review", "invoice", "sprint", "deploy", "meeting", "budget", "design",
+    "customer", "release", "backlog", "roadmap", "hiring", "audit", "migration", "training",
+)
+
+
+class Command(BaseCommand):
+
+    help = "Compare ILIKE search with the indexed search backend on synthetic tasks (rolled back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--vocabulary", type=int, default=5000)
+        parser.add_argument("--term", default="migration7")
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+        term = options["term"]
+        rng = random.Random(42)
+        words = [f"{STEMS[index % len(STEMS)]}{index // len(STEMS)}" for index in range(options["vocabulary"])]
+
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(email="search-benchmark@example.invalid")
+            Task.objects.bulk_create(
+                (
+                    Task(
+                        user=user,
+                        title=" ".join(rng.choices(words, k=4)),
+                        description=" ".join(rng.choices(words, k=24)),
+                        tags=",".join(rng.choices(words, k=2)),
+                    )
+                    for _ in range(rows)
+                ),
+                batch_size=1000,
+            )
+            queryset = Task.objects.filter(user=user)
+            backend = get_search_backend(queryset.db)
+
+            all_fields = Q(title__icontains=term) | Q(description__icontains=term) | Q(tags__icontains=term)
+            results = {
+                "ilike(title)": self.measure(lambda: queryset.filter(title__icontains=term), repeat),
+                "ilike(all)": self.measure(lambda: queryset.filter(all_fields), repeat),
+                backend: self.measure(lambda: search_tasks(queryset, [term], backend), repeat),
+            }
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"rows={rows} term={term!r} backend={backend} repeat={repeat}")
+        for label, (count, median) in results.items():
+            self.stdout.write(f"{label:>12}: matches={count:<7} median count+first page={median:.2f} ms")
+
+    def measure(self, build_queryset, repeat):
+        timings = []
+        count = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset = build_queryset()
+            if queryset is None:
+                return 0, 0.0
+            count = queryset.count()
+            list(queryset[:10])
+            timings.append((time.perf_counter() - started) * 1000)
+        return count, statistics.median(timings)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.tasks.models import Task
+from apps.tasks.serializers import TaskReadSerializer, TaskSerializer
+
+
+class Command(BaseCommand):
+
+    help = "Compare TaskSerializer with the values() read path on synthetic pages (rolled back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10,100,1000")
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(size) for size in options["sizes"].split(",")})
+        except ValueError as exc:
+            raise CommandError("--sizes must be a comma-separated list of integers.") from exc
+        repeat = options["repeat"]
+        renderer = JSONRenderer()
+
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(
+                email="serializer-benchmark@example.invalid",
+                first_name="Bench",
+                last_name="Mark",
+            )
+            now = timezone.now()
+            Task.objects.bulk_create(
+                (
+                    Task(
+                        user=user,
+                        title=f"Task {index}",
+                        description="Synthetic task used by the serializer benchmark",
+                        completed=index % 3 == 0,
+                        completed_at=now if index % 3 == 0 else None,
+                        due_date=now if index % 2 else None,
+                        tags="benchmark,serializer",
+                        estimated_time=index % 120,
+                    )
+                    for index in range(max(sizes))
+                ),
+                batch_size=1000,
+            )
+            queryset = Task.objects.filter(user=user)
+
+            self.stdout.write(f"repeat={repeat} (median of query + serialize + render)")
+            for size in sizes:
+                page = queryset[:size]
+                model_path = self.measure(
+                    lambda: renderer.render(TaskSerializer(page.select_related("user"), many=True).data),
+                    repeat,
+                )
+                values_path = self.measure(
+                    lambda: renderer.render(TaskReadSerializer(TaskReadSerializer.get_values(page), many=True).data),
+                    repeat,
+                )
+                self.stdout.write(
+                    f"rows={size:<5} TaskSerializer={model_path:8.2f} ms  "
+                    f"TaskReadSerializer={values_path:8.2f} ms  speedup={model_path / values_path:5.2f}x"
+                )
+            transaction.set_rollback(True)
+
+    def measure(self, render, repeat) -> float:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.tokens import UserClaimsRefreshToken
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Measure latency and throughput of a running server at several concurrency levels. "
+        "Start the WSGI or ASGI server separately and point --url at it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000/api/v1/tasks/")
+        parser.add_argument("--concurrency", default="100,500,1000")
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level.")
+        parser.add_argument("--token", help="Access token sent as a Bearer header.")
+        parser.add_argument("--email", help="Mint an access token for this existing user instead of --token.")
+        parser.add_argument("--label", default="", help="Name printed next to each result line.")
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme != "http" or not url.hostname:
+            raise CommandError("--url must be an http:// URL.")
+        try:
+            levels = [int(level) for level in options["concurrency"].split(",")]
+        except ValueError as exc:
+            raise CommandError("--concurrency must be a comma-separated list of integers.") from exc
+
+        token = options["token"] or self.mint_token(options["email"])
+        path = url.path or "/"
+        if url.query:
+            path = f"{path}?{url.query}"
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {url.netloc}\r\n"
+            f"Authorization: Bearer {token}\r\n"
+            "Accept: application/json\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("latin-1")
+
+        for level in levels:
+            latencies, errors, elapsed = asyncio.run(
+                self.run_level(url.hostname, url.port or 80, request, level, options["duration"])
+            )
+            self.report(options["label"], level, latencies, errors, elapsed)
+
+    def mint_token(self, email: str | None) -> str:
+        if not email:
+            raise CommandError("Pass --token or --email.")
+        try:
+            user = get_user_model().objects.get(email=email)
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"No user with email {email!r}.") from exc
+        return str(UserClaimsRefreshToken.for_user(user).access_token)
+
+    async def run_level(self, host, port, request, concurrency, duration):
+        latencies: list[float] = []
+        errors = [0]
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(
+            *(self.worker(host, port, request, deadline, latencies, errors) for _ in range(concurrency))
+        )
+        return latencies, errors[0], time.perf_counter() - started
+
+    async def worker(self, host, port, request, deadline, latencies, errors):
+        reader = writer = None
+        while time.perf_counter() < deadline:
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+                sent = time.perf_counter()
+                writer.write(request)
+                await writer.drain()
+                status_code, keep_alive = await self.read_response(reader)
+                if status_code != 200:
+                    errors[0] += 1
+                else:
+                    latencies.append((time.perf_counter() - sent) * 1000)
+                if not keep_alive:
+                    writer.close()
+                    writer = None
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors[0] += 1
+                if writer is not None:
+                    writer.close()
+                writer = None
+        if writer is not None:
+            writer.close()
+
+    async def read_response(self, reader) -> tuple[int, bool]:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status_code = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip().lower()
+
+        if headers.get("transfer-encoding") == "chunked":
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif "content-length" in headers:
+            await reader.readexactly(int(headers["content-length"]))
+        else:
+            await reader.read()
+            return status_code, False
+        return status_code, headers.get("connection") != "close"
+
+    def report(self, label, concurrency, latencies, errors, elapsed):
+        if len(latencies) < 2:
+            self.stdout.write(f"{label} c={concurrency}: ok={len(latencies)} errors={errors}")
+            return
+        percentiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"{label} c={concurrency:<5} ok={len(latencies):<7} errors={errors:<5} "
+            f"rps={len(latencies) / elapsed:8.1f} p50={percentiles[49]:8.1f} ms p99={percentiles[98]:8.1f} ms"
+        )
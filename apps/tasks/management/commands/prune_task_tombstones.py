@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from apps.tasks.changes import prune_tombstones
+
+
+class Command(BaseCommand):
+
+    help = "Delete task deletion tombstones older than TASK_TOMBSTONE_RETENTION_DAYS."
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} task tombstones."))
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from apps.tasks.stats import rebuild_task_stats
+
+
+class Command(BaseCommand):
+
+    help = "Recompute the TaskStats summary table from the tasks table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user-id", type=int, action="append", dest="user_ids", help="Only rebuild these users.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_task_stats(options["user_ids"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt task stats for {rebuilt} users."))
@@ -0,0 +1,74 @@
+from django.db import OperationalError, migrations
+
+
+SEARCH_FIELDS = ("title", "description", "tags")
+POSTGRES_SEARCH_INDEX = "tasks_task_search_gin"
+SQLITE_SEARCH_TABLE = "tasks_task_fts"
+
+
+def get_postgres_search_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(SearchVector(*SEARCH_FIELDS, config="english"), name=POSTGRES_SEARCH_INDEX)
+
+
+def add_search_index(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(Task, get_postgres_search_index())
+        return
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    table = Task._meta.db_table
+    columns = ", ".join(SEARCH_FIELDS)
+    new_values = ", ".join(f"new.{field}" for field in SEARCH_FIELDS)
+    old_values = ", ".join(f"old.{field}" for field in SEARCH_FIELDS)
+    fts = SQLITE_SEARCH_TABLE
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, "
+            f"content='{table}', content_rowid='id', prefix='2 3', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        )
+    except OperationalError:
+        # SQLite was built without FTS5; search falls back to LIKE.
+        return
+
+    schema_editor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    )
+    schema_editor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def remove_search_index(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(Task, get_postgres_search_index())
+    elif schema_editor.connection.vendor == "sqlite":
+        fts = SQLITE_SEARCH_TABLE
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_alter_task_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_index, remove_search_index),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+
+def split_tags(value):
+    names = (name.strip().lower() for name in (value or "").split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def populate_task_tags(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    Tag = apps.get_model("tasks", "Tag")
+    TaskTag = apps.get_model("tasks", "TaskTag")
+    db = schema_editor.connection.alias
+
+    last_id = 0
+    while True:
+        batch = list(
+            Task.objects.using(db)
+            .filter(id__gt=last_id)
+            .exclude(tags="")
+            .order_by("id")
+            .values_list("id", "tags")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        last_id = batch[-1][0]
+
+        wanted = {task_id: split_tags(tags) for task_id, tags in batch}
+        names = {name for task_names in wanted.values() for name in task_names}
+        if not names:
+            continue
+        Tag.objects.using(db).bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+        tag_ids = dict(Tag.objects.using(db).filter(name__in=names).values_list("name", "id"))
+        TaskTag.objects.using(db).bulk_create(
+            [
+                TaskTag(task_id=task_id, tag_id=tag_ids[name])
+                for task_id, task_names in wanted.items()
+                for name in task_names
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_task_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-17 01:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_user_status_due_indexes'),
+        ('users', '0005_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('status_pending', models.PositiveIntegerField(default=0)),
+                ('status_in_progress', models.PositiveIntegerField(default=0)),
+                ('status_completed', models.PositiveIntegerField(default=0)),
+                ('status_cancelled', models.PositiveIntegerField(default=0)),
+                ('priority_low', models.PositiveIntegerField(default=0)),
+                ('priority_medium', models.PositiveIntegerField(default=0)),
+                ('priority_high', models.PositiveIntegerField(default=0)),
+                ('estimated_time', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'task stats',
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import migrations
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+BATCH_SIZE = 1000
+STATUSES = ("PENDING", "IN_PROGRESS", "COMPLETED", "CANCELLED")
+PRIORITIES = ("LOW", "MEDIUM", "HIGH")
+
+
+def populate_task_stats(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    TaskStats = apps.get_model("tasks", "TaskStats")
+    db = schema_editor.connection.alias
+
+    aggregates = {
+        "total": Count("id"),
+        "completed": Count("id", filter=Q(completed=True)),
+        "estimated_time": Coalesce(Sum("estimated_time"), 0),
+    }
+    for value in STATUSES:
+        aggregates[f"status_{value.lower()}"] = Count("id", filter=Q(status=value))
+    for value in PRIORITIES:
+        aggregates[f"priority_{value.lower()}"] = Count("id", filter=Q(priority=value))
+
+    rows = Task.objects.using(db).order_by().values("user_id").annotate(**aggregates).order_by("user_id")
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(TaskStats(**row))
+        if len(batch) == BATCH_SIZE:
+            TaskStats.objects.using(db).bulk_create(batch)
+            batch = []
+    TaskStats.objects.using(db).bulk_create(batch)
+
+
+def clear_task_stats(apps, schema_editor):
+    apps.get_model("tasks", "TaskStats").objects.using(schema_editor.connection.alias).all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_task_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_task_stats, clear_task_stats),
+    ]
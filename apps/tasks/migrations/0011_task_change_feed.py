@@ -0,0 +1,42 @@
+# Generated by Django 5.0.14 on 2026-10-17 01:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_populate_task_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.PositiveBigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='tasks_task_user_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='deletedtask',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='deletedtask',
+            index=models.Index(fields=['user', 'id'], name='tasks_delet_user_id_51ca64_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deletedtask',
+            index=models.Index(fields=['deleted_at'], name='tasks_delet_deleted_47bc2a_idx'),
+        ),
+    ]
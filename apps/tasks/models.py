@@ -2,9 +2,20 @@ from __future__ import annotations
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
 from django.utils import timezone
 
 
+class TaskQuerySet(models.QuerySet):
+
+    def with_user_name(self):
+        full_name = Trim(Concat("user__first_name", Value(" "), "user__last_name"))
+        return self.annotate(
+            user_name=Coalesce(NullIf(full_name, Value("")), "user__email", output_field=models.CharField())
+        )
+
+
 class Task(models.Model):
     class PriorityChoices(models.TextChoices):
         LOW = "LOW", "Low"
@@ -42,22 +53,143 @@ class Task(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    normalized_tags = models.ManyToManyField(
+        "Tag",
+        through="TaskTag",
+        related_name="tasks",
+        blank=True,
+    )
+
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "id"]
         indexes = [
             models.Index(fields=["status"]),
             models.Index(fields=["priority"]),
             models.Index(fields=["due_date"]),
             models.Index(fields=["user", "completed"]),
+            models.Index(fields=["-created_at", "id"]),
+            models.Index(fields=["user", "-created_at", "id"]),
+            models.Index(fields=["user", "status", "-created_at", "id"], name="tasks_task_user_status_idx"),
+            models.Index(fields=["user", "due_date"], name="tasks_task_user_due_idx"),
+            models.Index(fields=["user", "updated_at", "id"], name="tasks_task_user_updated_idx"),
         ]
 
-    def save(self, *args, **kwargs):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_tags = instance.__dict__.get("tags")
+        instance._loaded_stats = instance.get_stats_contribution()
+        return instance
+
+    def get_stats_contribution(self) -> tuple[int, dict[str, int]] | None:
+        if any(field not in self.__dict__ for field in ("user_id", *TaskStats.SOURCE_FIELDS)):
+            return None
+        return self.user_id, {
+            "total": 1,
+            "completed": int(self.completed),
+            f"status_{self.status.lower()}": 1,
+            f"priority_{self.priority.lower()}": 1,
+            "estimated_time": self.estimated_time or 0,
+        }
+
+    def tags_changed(self) -> bool:
+        if "tags" not in self.__dict__:
+            return False
+        return self.tags != getattr(self, "_loaded_tags", "")
+
+    def apply_completion(self, now=None) -> None:
         if self.completed and not self.completed_at:
-            self.completed_at = timezone.now()
+            self.completed_at = now or timezone.now()
         elif not self.completed:
             self.completed_at = None
+
+    def save(self, *args, **kwargs):
+        self.apply_completion()
         super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return f"{self.title} ({self.priority})"
+
+
+class Tag(models.Model):
+
+    name = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class TaskTag(models.Model):
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="task_tags")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="task_tags")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["task", "tag"], name="tasks_tasktag_unique_task_tag"),
+        ]
+        indexes = [
+            models.Index(fields=["tag", "task"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task_id}:{self.tag_id}"
+
+
+class DeletedTask(models.Model):
+
+    task_id = models.PositiveBigIntegerField()
+    # No database constraint: tombstones are written while a deleted user's tasks cascade.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "id"]),
+            models.Index(fields=["deleted_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task_id} deleted at {self.deleted_at}"
+
+
+class TaskStats(models.Model):
+
+    SOURCE_FIELDS = ("completed", "status", "priority", "estimated_time")
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="task_stats",
+    )
+    total = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    status_pending = models.PositiveIntegerField(default=0)
+    status_in_progress = models.PositiveIntegerField(default=0)
+    status_completed = models.PositiveIntegerField(default=0)
+    status_cancelled = models.PositiveIntegerField(default=0)
+    priority_low = models.PositiveIntegerField(default=0)
+    priority_medium = models.PositiveIntegerField(default=0)
+    priority_high = models.PositiveIntegerField(default=0)
+    estimated_time = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "task stats"
+
+    @classmethod
+    def counter_fields(cls) -> list[str]:
+        return [field.name for field in cls._meta.concrete_fields if not field.primary_key]
+
+    def __str__(self) -> str:
+        return f"{self.user_id}: {self.total} tasks"
@@ -1,7 +1,273 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime
+from functools import cached_property, partial
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from rest_framework.pagination import PageNumberPagination
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from config.cache import is_shared_cache
+
+from .cache import get_task_scope, get_task_version
+
+
+class TaskPaginator(DjangoPaginator):
+
+    def __init__(self, object_list, per_page, counter=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.counter = counter
+
+    @cached_property
+    def count(self) -> int:
+        if self.counter is None:
+            return super().count
+        return self.counter(self.object_list)
 
 
 class TaskPagination(PageNumberPagination):
 
     page_size = settings.REST_FRAMEWORK.get("PAGE_SIZE", 10)
+    count_query_param = "count"
+    count_strategies = ("exact", "estimate", "cached")
+
+    def is_count_enabled(self, request) -> bool:
+        return request.query_params.get(self.count_query_param, "").lower() not in {"0", "false", "no"}
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.count_enabled = self.is_count_enabled(request)
+        if not self.count_enabled:
+            return self.set_page_without_count(list(self.get_window(queryset, request)))
+
+        self.django_paginator_class = partial(TaskPaginator, counter=self.get_counter(request))
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.count_enabled = self.is_count_enabled(request)
+        if not self.count_enabled:
+            return self.set_page_without_count([row async for row in self.get_window(queryset, request)])
+
+        count = await self.acount(request, queryset)
+        paginator = TaskPaginator(queryset, self.get_page_size(request), counter=lambda _: count)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            ) from exc
+        self.page.object_list = [row async for row in self.page.object_list]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+    def get_window(self, queryset, request):
+        self.page_size = self.get_page_size(request)
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param) or 1)
+        except ValueError as exc:
+            raise NotFound(self.invalid_page_message) from exc
+        if self.page_number < 1:
+            raise NotFound(self.invalid_page_message)
+
+        offset = (self.page_number - 1) * self.page_size
+        return queryset[offset : offset + self.page_size + 1]
+
+    def set_page_without_count(self, results):
+        self.has_next = len(results) > self.page_size
+        return results[: self.page_size]
+
+    def get_count_strategy(self) -> str:
+        strategy = getattr(settings, "TASK_COUNT_STRATEGY", "exact")
+        if strategy not in self.count_strategies:
+            return "exact"
+        # Cached counts are keyed on task versions, which writes handled by other workers only bump in a shared cache.
+        if strategy == "cached" and not is_shared_cache():
+            return "exact"
+        return strategy
+
+    def get_counter(self, request):
+        strategy = self.get_count_strategy()
+        if strategy == "estimate":
+            return self.estimate_count
+        if strategy == "cached":
+            return partial(self.cached_count, request)
+        return None
+
+    def estimate_count(self, queryset) -> int:
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return queryset.count()
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate < getattr(settings, "TASK_COUNT_ESTIMATE_THRESHOLD", 1000):
+            return queryset.count()
+        return estimate
+
+    def get_count_cache_key(self, request) -> str:
+        scope = get_task_scope(request.user)
+        filters = sorted(
+            (key, value)
+            for key, value in request.query_params.lists()
+            if key not in {self.page_query_param, self.count_query_param}
+        )
+        digest = hashlib.md5(json.dumps(filters).encode("utf-8")).hexdigest()
+        return f"tasks:count:{scope or 'all'}:{get_task_version(scope)}:{digest}"
+
+    def cached_count(self, request, queryset) -> int:
+        key = self.get_count_cache_key(request)
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, getattr(settings, "TASK_COUNT_CACHE_TTL", 60))
+        return count
+
+    async def acount(self, request, queryset) -> int:
+        strategy = self.get_count_strategy()
+        if strategy == "estimate":
+            return await sync_to_async(self.estimate_count)(queryset)
+        if strategy != "cached":
+            return await queryset.acount()
+
+        key = await sync_to_async(self.get_count_cache_key)(request)
+        count = await cache.aget(key)
+        if count is None:
+            count = await queryset.acount()
+            await cache.aset(key, count, getattr(settings, "TASK_COUNT_CACHE_TTL", 60))
+        return count
+
+    def get_paginated_response(self, data):
+        if self.count_enabled:
+            return super().get_paginated_response(data)
+        return Response(
+            {
+                "has_next": self.has_next,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if self.count_enabled:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.count_enabled:
+            return super().get_previous_link()
+        if self.page_number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+
+class TaskCursorPagination(CursorPagination):
+
+    page_size = settings.REST_FRAMEWORK.get("PAGE_SIZE", 10)
+    ordering = ("-created_at", "id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_window(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return self.set_page([row async for row in self.get_window(queryset, request)])
+
+    def get_window(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+
+        self.reverse = bool(self.cursor and self.cursor.reverse)
+        self.current_position = self.cursor.position if self.cursor else None
+        ordering = self.get_reversed_ordering() if self.reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if self.current_position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(ordering, self.current_position))
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if self.reverse:
+            self.page.reverse()
+
+        has_position = self.current_position is not None
+        self.has_next = has_position if self.reverse else has_more
+        self.has_previous = has_more if self.reverse else has_position
+        return self.page
+
+    def get_reversed_ordering(self) -> tuple[str, ...]:
+        return tuple(field[1:] if field.startswith("-") else f"-{field}" for field in self.ordering)
+
+    def get_keyset_filter(self, ordering, position) -> Q:
+        keyset = Q()
+        equal_prefix = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            keyset |= equal_prefix & Q(**{f"{name}__{lookup}": value})
+            equal_prefix &= Q(**{name: value})
+        return keyset
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+        try:
+            position = json.loads(cursor.position)
+        except ValueError as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=cursor.reverse, position=position)
+
+    def encode_position(self, instance) -> str:
+        values = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            values.append(value.isoformat() if isinstance(value, datetime) else value)
+        return json.dumps(values, separators=(",", ":"))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self.encode_position(self.page[-1])
+        else:
+            position = json.dumps(self.current_position, separators=(",", ":"))
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self.encode_position(self.page[0])
+        else:
+            position = json.dumps(self.current_position, separators=(",", ":"))
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
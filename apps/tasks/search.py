@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+
+SEARCH_FIELDS = ("title", "description", "tags")
+SEARCH_CONFIG = "english"
+SQLITE_SEARCH_TABLE = "tasks_task_fts"
+SQLITE_SEARCH_TRIGGERS = tuple(f"{SQLITE_SEARCH_TABLE}_{suffix}" for suffix in ("ai", "ad", "au"))
+
+_sqlite_search_indexes: dict[tuple[str, str], bool] = {}
+
+
+def get_search_vector():
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector(*SEARCH_FIELDS, config=SEARCH_CONFIG)
+
+
+def get_search_backend(alias: str) -> str:
+    if getattr(settings, "TASK_SEARCH_BACKEND", "auto") != "auto":
+        return settings.TASK_SEARCH_BACKEND
+    connection = connections[alias]
+    if connection.vendor == "postgresql":
+        return "postgresql"
+    if connection.vendor == "sqlite" and has_sqlite_search_index(alias):
+        return "sqlite"
+    return "ilike"
+
+
+def has_sqlite_search_index(alias: str) -> bool:
+    # Without its triggers the FTS table silently goes stale, so both must be present.
+    connection = connections[alias]
+    key = (alias, str(connection.settings_dict["NAME"]))
+    if key not in _sqlite_search_indexes:
+        with connection.cursor() as cursor:
+            tables = connection.introspection.table_names(cursor)
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            triggers = {row[0] for row in cursor.fetchall()}
+        _sqlite_search_indexes[key] = SQLITE_SEARCH_TABLE in tables and triggers.issuperset(
+            SQLITE_SEARCH_TRIGGERS
+        )
+    return _sqlite_search_indexes[key]
+
+
+def get_search_words(terms) -> list[str]:
+    return [word for term in terms for word in re.findall(r"\w+", term)]
+
+
+def search_tasks(queryset, terms, backend: str | None = None):
+    words = get_search_words(terms)
+    backend = backend or get_search_backend(queryset.db)
+    if not words or backend == "ilike":
+        return None
+
+    ordering = queryset.model._meta.ordering
+    if backend == "postgresql":
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(
+            " & ".join(f"{word}:*" for word in words),
+            config=SEARCH_CONFIG,
+            search_type="raw",
+        )
+        vector = get_search_vector()
+        return (
+            queryset.annotate(search_vector=vector, search_rank=SearchRank(vector, query))
+            .filter(search_vector=query)
+            .order_by("-search_rank", *ordering)
+        )
+
+    match = " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+    fts = SQLITE_SEARCH_TABLE
+    table = queryset.model._meta.db_table
+    return (
+        queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", (match,)),
+        )
+        .annotate(
+            search_rank=RawSQL(
+                f"SELECT rank FROM (SELECT rowid AS doc_id, rank FROM {fts} "
+                f"WHERE {fts} MATCH %s LIMIT -1) WHERE doc_id = {table}.id",
+                (match,),
+            )
+        )
+        .order_by("search_rank", *ordering)
+    )
+
+
+class TaskSearchFilter(filters.SearchFilter):
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        results = search_tasks(queryset, terms)
+        if results is None:
+            return super().filter_queryset(request, queryset, view)
+        return results
+
@@ -1,11 +1,69 @@
 from __future__ import annotations
 
+from functools import cached_property
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
+from config.metrics import TimedSerializerMixin, serializer_timer
+
+from .cache import bump_task_versions_on_commit
+from .events import publish_task_event
 from .models import Task
+from .stats import record_task_stats
+from .tags import sync_task_tags
+
+
+class TaskListSerializer(serializers.ListSerializer):
+
+    def get_writable_fields(self) -> list[str]:
+        return [name for name, field in self.child.fields.items() if not field.read_only]
 
+    def run_child_validation(self, data):
+        if self.instance is not None:
+            self.child.instance = self.instances_by_id.get(data.get("id"))
+            self.child.initial_data = data
+        return super().run_child_validation(data)
 
-class TaskSerializer(serializers.ModelSerializer):
+    @cached_property
+    def instances_by_id(self) -> dict[int, Task]:
+        return {task.id: task for task in self.instance}
+
+    def create(self, validated_data):
+        now = timezone.now()
+        tasks = [Task(**attrs) for attrs in validated_data]
+        for task in tasks:
+            task.apply_completion(now)
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks)
+            sync_task_tags(task for task in tasks if task.tags_changed())
+            record_task_stats(tasks, created=True)
+            for task in tasks:
+                publish_task_event("created", task)
+        bump_task_versions_on_commit(task.user_id for task in tasks)
+        return tasks
+
+    def update(self, instance, validated_data):
+        now = timezone.now()
+        for task, attrs in zip(instance, validated_data):
+            for field, value in attrs.items():
+                setattr(task, field, value)
+            task.apply_completion(now)
+            task.updated_at = now
+        fields = [*self.get_writable_fields(), "completed_at", "updated_at"]
+        with transaction.atomic():
+            Task.objects.bulk_update(instance, fields)
+            sync_task_tags(task for task in instance if task.tags_changed())
+            record_task_stats(instance)
+            for task in instance:
+                publish_task_event("updated", task)
+        bump_task_versions_on_commit(task.user_id for task in instance)
+        return instance
+
+
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user_name = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
@@ -27,8 +85,11 @@ class TaskSerializer(serializers.ModelSerializer):
             "updated_at",
         )
         read_only_fields = ("id", "user_name", "completed_at", "created_at", "updated_at")
+        list_serializer_class = TaskListSerializer
 
     def get_user_name(self, obj) -> str:
+        if hasattr(obj, "user_name"):
+            return obj.user_name
         full_name = f"{obj.user.first_name} {obj.user.last_name}".strip()
         if full_name:
             return full_name
@@ -39,3 +100,65 @@ class TaskSerializer(serializers.ModelSerializer):
         if not cleaned:
             raise serializers.ValidationError("Title cannot be blank.")
         return cleaned
+
+
+def format_datetime(value, tz) -> str | None:
+    if not value:
+        return None
+    value = value.astimezone(tz).isoformat() if tz is not None else value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class TaskReadSerializer:
+
+    fields = TaskSerializer.Meta.fields
+    datetime_fields = ("due_date", "completed_at", "created_at", "updated_at")
+    # Always selected: permission checks, ETags and cursor positions read them.
+    required_columns = ("id", "user_id", "created_at", "updated_at")
+
+    def __init__(self, instance, many: bool = False, fields: tuple[str, ...] | None = None):
+        self.instance = instance
+        self.many = many
+        if fields is not None:
+            self.fields = fields
+
+    @classmethod
+    def get_requested_fields(cls, query_params) -> tuple[str, ...]:
+        requested = cls.parse_field_names(query_params, "fields") or cls.fields
+        omitted = cls.parse_field_names(query_params, "omit")
+        fields = tuple(field for field in cls.fields if field in requested and field not in omitted)
+        if not fields:
+            raise serializers.ValidationError({"fields": ["At least one field must be returned."]})
+        return fields
+
+    @classmethod
+    def parse_field_names(cls, query_params, param: str) -> set[str]:
+        names = {name.strip() for name in query_params.get(param, "").split(",") if name.strip()}
+        unknown = names.difference(cls.fields)
+        if unknown:
+            raise serializers.ValidationError({param: [f"Unknown field(s): {', '.join(sorted(unknown))}."]})
+        return names
+
+    @classmethod
+    def get_values(cls, queryset, fields: tuple[str, ...] | None = None):
+        fields = fields or cls.fields
+        if "user_name" in fields:
+            queryset = queryset.with_user_name()
+        return queryset.values(*fields, *(column for column in cls.required_columns if column not in fields))
+
+    @property
+    def data(self):
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        with serializer_timer():
+            if self.many:
+                return [self.to_representation(row, tz) for row in self.instance]
+            return self.to_representation(self.instance, tz)
+
+    def to_representation(self, row: dict, tz) -> dict:
+        data = {field: row[field] for field in self.fields}
+        for field in self.datetime_fields:
+            if field in data:
+                data[field] = format_datetime(data[field], tz)
+        return data
@@ -0,0 +1,73 @@
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_task_versions_on_commit
+from .events import publish_task_event
+from .models import DeletedTask, Task
+from .stats import discard_task_stats, record_task_stats
+from .tags import sync_task_tags
+
+
+# Set while delete_tasks() writes tombstones, stats and events for the whole batch itself.
+bulk_deleting: ContextVar[bool] = ContextVar("bulk_deleting", default=False)
+
+
+def delete_tasks(tasks: list[Task]) -> None:
+    # The per-row post_delete receivers cost two queries per task; cascades and single deletes keep them.
+    reset = bulk_deleting.set(True)
+    try:
+        with transaction.atomic():
+            Task.objects.filter(id__in=[task.id for task in tasks]).delete()
+            DeletedTask.objects.bulk_create(DeletedTask(task_id=task.id, user_id=task.user_id) for task in tasks)
+            discard_task_stats(tasks)
+            for task in tasks:
+                publish_task_event("deleted", task)
+    finally:
+        bulk_deleting.reset(reset)
+    bump_task_versions_on_commit(task.user_id for task in tasks)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_versions(sender, instance: Task, **kwargs) -> None:
+    if not bulk_deleting.get():
+        bump_task_versions_on_commit([instance.user_id])
+
+
+@receiver(post_save, sender=Task)
+def sync_normalized_tags(sender, instance: Task, raw: bool = False, **kwargs) -> None:
+    if not raw and instance.tags_changed():
+        sync_task_tags([instance])
+
+
+@receiver(post_save, sender=Task)
+def update_task_stats(sender, instance: Task, created: bool, raw: bool = False, **kwargs) -> None:
+    if not raw:
+        record_task_stats([instance], created=created)
+
+
+@receiver(post_delete, sender=Task)
+def remove_task_stats(sender, instance: Task, **kwargs) -> None:
+    if not bulk_deleting.get():
+        discard_task_stats([instance])
+
+
+@receiver(post_delete, sender=Task)
+def record_deleted_task(sender, instance: Task, **kwargs) -> None:
+    if not bulk_deleting.get():
+        DeletedTask.objects.create(task_id=instance.id, user_id=instance.user_id)
+
+
+@receiver(post_save, sender=Task)
+def publish_saved_task(sender, instance: Task, created: bool, raw: bool = False, **kwargs) -> None:
+    if not raw:
+        publish_task_event("created" if created else "updated", instance)
+
+
+@receiver(post_delete, sender=Task)
+def publish_deleted_task(sender, instance: Task, **kwargs) -> None:
+    if not bulk_deleting.get():
+        publish_task_event("deleted", instance)
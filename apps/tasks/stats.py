@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Task, TaskStats
+
+
+def get_stats_aggregates() -> dict:
+    aggregates = {
+        "total": Count("id"),
+        "completed": Count("id", filter=Q(completed=True)),
+        "estimated_time": Coalesce(Sum("estimated_time"), 0),
+    }
+    for value in Task.StatusChoices.values:
+        aggregates[f"status_{value.lower()}"] = Count("id", filter=Q(status=value))
+    for value in Task.PriorityChoices.values:
+        aggregates[f"priority_{value.lower()}"] = Count("id", filter=Q(priority=value))
+    return aggregates
+
+
+def rebuild_task_stats(user_ids: Iterable[int] | None = None, batch_size: int = 1000) -> int:
+    tasks = Task.objects.order_by()
+    stats = TaskStats.objects.all()
+    if user_ids is not None:
+        user_ids = set(user_ids)
+        tasks = tasks.filter(user_id__in=user_ids)
+        stats = stats.filter(user_id__in=user_ids)
+
+    rows = tasks.values("user_id").annotate(**get_stats_aggregates()).order_by("user_id")
+    # Two first tasks for the same user can both find no row and rebuild it; upsert so the
+    # later insert overwrites the counters instead of failing the write with an IntegrityError.
+    create = partial(
+        TaskStats.objects.bulk_create,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=TaskStats.counter_fields(),
+    )
+    rebuilt = 0
+    with transaction.atomic():
+        stats.delete()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(TaskStats(**row))
+            if len(batch) == batch_size:
+                create(batch)
+                rebuilt += len(batch)
+                batch = []
+        if batch:
+            create(batch)
+    return rebuilt + len(batch)
+
+
+def apply_stats_deltas(deltas: dict[int, Counter], rebuild_missing: bool = True) -> None:
+    missing = set()
+    for user_id, delta in deltas.items():
+        # Counters are unsigned, so clamp decrements: drifted stats must never fail the task write.
+        changes = {
+            field: F(field) + value if value > 0 else Greatest(F(field) + value, 0)
+            for field, value in delta.items()
+            if value
+        }
+        if changes and not TaskStats.objects.filter(user_id=user_id).update(**changes):
+            missing.add(user_id)
+    if missing and rebuild_missing:
+        rebuild_task_stats(missing)
+
+
+def record_task_stats(tasks: Iterable[Task], created: bool = False) -> None:
+    deltas: dict[int, Counter] = defaultdict(Counter)
+    stale = set()
+    for task in tasks:
+        previous = None if created else getattr(task, "_loaded_stats", None)
+        current = task.get_stats_contribution()
+        if current is None or (previous is None and not created):
+            # Nothing reliable to diff against (deferred fields or an instance not loaded from the database).
+            stale.add(task.user_id)
+            continue
+        if previous is not None:
+            deltas[previous[0]].subtract(previous[1])
+        deltas[current[0]].update(current[1])
+        task._loaded_stats = current
+
+    apply_stats_deltas(deltas)
+    if stale:
+        rebuild_task_stats(stale)
+
+
+def discard_task_stats(tasks: Iterable[Task]) -> None:
+    deltas: dict[int, Counter] = defaultdict(Counter)
+    stale = set()
+    for task in tasks:
+        previous = getattr(task, "_loaded_stats", None) or task.get_stats_contribution()
+        if previous is None:
+            stale.add(task.user_id)
+            continue
+        deltas[previous[0]].subtract(previous[1])
+
+    # A missing row during a cascade means the user is being deleted too; do not recreate it.
+    apply_stats_deltas(deltas, rebuild_missing=False)
+    if stale:
+        rebuild_task_stats(stale)
+
+
+def get_task_stats(user_id: int | None = None) -> dict:
+    stats = TaskStats.objects.all()
+    overdue = Task.objects.filter(completed=False, due_date__lt=timezone.now())
+    if user_id is not None:
+        stats = stats.filter(user_id=user_id)
+        overdue = overdue.filter(user_id=user_id)
+
+    totals = stats.aggregate(**{field: Coalesce(Sum(field), 0) for field in TaskStats.counter_fields()})
+    return {
+        "total": totals["total"],
+        "completed": totals["completed"],
+        "overdue": overdue.count(),
+        "estimated_time": totals["estimated_time"],
+        "by_status": {value: totals[f"status_{value.lower()}"] for value in Task.StatusChoices.values},
+        "by_priority": {value: totals[f"priority_{value.lower()}"] for value in Task.PriorityChoices.values},
+    }
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.db.models import Count, Q
+
+from .models import Tag, Task, TaskTag
+
+
+def parse_tag_names(value: str | None) -> list[str]:
+    names = (name.strip().lower() for name in (value or "").split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def sync_task_tags(tasks: Iterable[Task]) -> None:
+    tasks = list(tasks)
+    wanted = {task.id: parse_tag_names(task.tags) for task in tasks}
+    if not wanted:
+        return
+
+    names = {name for task_names in wanted.values() for name in task_names}
+    tag_ids = {}
+    if names:
+        Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+        tag_ids = dict(Tag.objects.filter(name__in=names).values_list("name", "id"))
+
+    existing = set(TaskTag.objects.filter(task_id__in=wanted).values_list("task_id", "tag_id"))
+    desired = {(task_id, tag_ids[name]) for task_id, task_names in wanted.items() for name in task_names}
+
+    stale = existing - desired
+    if stale:
+        condition = Q()
+        for task_id, tag_id in stale:
+            condition |= Q(task_id=task_id, tag_id=tag_id)
+        TaskTag.objects.filter(condition).delete()
+    missing = desired - existing
+    if missing:
+        TaskTag.objects.bulk_create(
+            [TaskTag(task_id=task_id, tag_id=tag_id) for task_id, tag_id in missing],
+            ignore_conflicts=True,
+        )
+
+    for task in tasks:
+        task._loaded_tags = task.tags
+
+
+def filter_by_tags(queryset, names: list[str], match: str = "any"):
+    links = TaskTag.objects.filter(tag__name__in=names)
+    if match == "all":
+        links = (
+            links.values("task_id")
+            .annotate(matched=Count("tag_id", distinct=True))
+            .filter(matched=len(names))
+        )
+    return queryset.filter(id__in=links.values("task_id"))
@@ -1,21 +1,85 @@
 from __future__ import annotations
 
+import tempfile
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import wraps
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.users.authentication import ClaimsUser
 from apps.users.models import UserType
+from apps.users.tokens import UserClaimsRefreshToken
+from config.database import get_pragma_statements
+from config.metrics import METRICS, render_metrics
+from config.middleware import replica_routing_middleware
+from config.routers import PrimaryReplicaRouter
 
-from .models import Task
+from . import search
+from .async_views import AsyncTaskDetailAPIView, AsyncTaskListCreateAPIView, TaskEventsAPIView
+from .changes import ChangeToken
+from .events import InMemoryTaskEventBroker, get_task_event_broker
+from .filters import TaskFilter
+from .models import DeletedTask, Tag, Task, TaskStats, TaskTag
+from .serializers import TaskReadSerializer, TaskSerializer
+from .stats import rebuild_task_stats
 
 
 User = get_user_model()
 
 
+@contextmanager
+def shared_cache_settings():
+    # Local memory is private to one process, so features every worker must agree on refuse it.
+    with tempfile.TemporaryDirectory() as location:
+        backend = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location}
+        with override_settings(CACHES={"default": backend}):
+            yield
+
+
+def shared_cache(test_method):
+    @wraps(test_method)
+    def inner(*args, **kwargs):
+        with shared_cache_settings():
+            return test_method(*args, **kwargs)
+
+    return inner
+
+
+class RecordingTaskEventBroker(InMemoryTaskEventBroker):
+
+    def __init__(self):
+        super().__init__()
+        self.published = []
+
+    def publish(self, event: dict) -> None:
+        self.published.append(event)
+        super().publish(event)
+
+
 class TaskAPITests(APITestCase):
 
     def setUp(self) -> None:
+        cache.clear()
         self.password = "StrongPass123!"
         user_role = UserType.objects.get(code=UserType.USER)
         admin_role = UserType.objects.get(code=UserType.ADMIN)
@@ -53,6 +117,8 @@ class TaskAPITests(APITestCase):
             description="Task owned by another user",
             completed=True,
         )
+        self.user_task_id = self.user_task.id
+        self.other_task_id = self.other_task.id
         self.list_url = reverse("v1:task-list-create")
         self.detail_url = reverse("v1:task-detail", kwargs={"task_id": self.user_task.id})
 
@@ -193,6 +259,65 @@ class TaskAPITests(APITestCase):
         self.assertEqual(response.data["count"], 1)
         self.assertTrue(response.data["results"][0]["completed"])
 
+    def test_filter_tasks_by_status_priority_and_active(self) -> None:
+        in_progress = Task.objects.create(
+            user=self.user,
+            title="In progress",
+            status=Task.StatusChoices.IN_PROGRESS,
+            priority=Task.PriorityChoices.HIGH,
+        )
+        Task.objects.create(user=self.user, title="Cancelled", status=Task.StatusChoices.CANCELLED, is_active=False)
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(f"{self.list_url}?status__in=PENDING,IN_PROGRESS", format="json")
+        self.assertEqual({task["id"] for task in response.data["results"]}, {self.user_task.id, in_progress.id})
+
+        response = self.client.get(f"{self.list_url}?status__in=IN_PROGRESS&priority__in=HIGH,LOW", format="json")
+        self.assertEqual([task["id"] for task in response.data["results"]], [in_progress.id])
+
+        response = self.client.get(f"{self.list_url}?is_active=false", format="json")
+        self.assertEqual([task["title"] for task in response.data["results"]], ["Cancelled"])
+
+        response = self.client.get(f"{self.list_url}?status__in=DONE", format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_tasks_by_due_and_created_ranges_and_overdue(self) -> None:
+        now = timezone.now()
+        overdue = Task.objects.create(user=self.user, title="Overdue", due_date=now - timedelta(days=1))
+        upcoming = Task.objects.create(user=self.user, title="Upcoming", due_date=now + timedelta(days=3))
+        Task.objects.create(user=self.user, title="Done late", due_date=now - timedelta(days=2), completed=True)
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.list_url, {"overdue": "true"}, format="json")
+        self.assertEqual([task["id"] for task in response.data["results"]], [overdue.id])
+
+        response = self.client.get(self.list_url, {"overdue": "false"}, format="json")
+        self.assertNotIn(overdue.id, {task["id"] for task in response.data["results"]})
+        self.assertEqual(response.data["count"], 3)
+
+        response = self.client.get(
+            self.list_url,
+            {"due_date_after": now.isoformat(), "due_date_before": (now + timedelta(days=7)).isoformat()},
+            format="json",
+        )
+        self.assertEqual([task["id"] for task in response.data["results"]], [upcoming.id])
+
+        response = self.client.get(
+            self.list_url, {"created_at_before": (now - timedelta(days=1)).isoformat()}, format="json"
+        )
+        self.assertEqual(response.data["count"], 0)
+
+    def test_status_and_overdue_filters_use_per_user_indexes(self) -> None:
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plan assertions are written for SQLite.")
+        queryset = Task.objects.filter(user=self.user)
+
+        plan = TaskFilter({"overdue": "true"}, queryset=queryset).qs.explain()
+        self.assertIn("tasks_task_user_due_idx", plan)
+
+        plan = TaskFilter({"status__in": "PENDING"}, queryset=queryset).qs.order_by("-created_at", "id").explain()
+        self.assertIn("tasks_task_user_status_idx", plan)
+
     def test_search_tasks_by_title(self) -> None:
         Task.objects.create(user=self.user, title="Buy groceries", completed=False)
         Task.objects.create(user=self.user, title="Plan sprint", completed=False)
@@ -216,3 +341,948 @@ class TaskAPITests(APITestCase):
         self.assertIn("previous", response.data)
         self.assertIn("results", response.data)
         self.assertEqual(len(response.data["results"]), 10)
+
+    def test_cursor_pagination_walks_all_tasks_without_count(self) -> None:
+        for index in range(23):
+            Task.objects.create(user=self.user, title=f"Task {index}", completed=False)
+        Task.objects.filter(user=self.user).update(created_at=self.user_task.created_at)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(f"{self.list_url}?cursor=", format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["previous"])
+
+        seen_ids = [task["id"] for task in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"], format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen_ids.extend(task["id"] for task in response.data["results"])
+
+        expected_ids = list(Task.objects.filter(user=self.user).values_list("id", flat=True))
+        self.assertEqual(seen_ids, expected_ids)
+        self.assertEqual(len(seen_ids), 24)
+
+        previous_response = self.client.get(response.data["previous"], format="json")
+        self.assertEqual(
+            [task["id"] for task in previous_response.data["results"]],
+            seen_ids[10:20],
+        )
+
+    def test_cursor_pagination_rejects_invalid_cursor(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(f"{self.list_url}?cursor=cD1nYXJiYWdl", format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_count_false_returns_has_next_without_count_query(self) -> None:
+        for index in range(12):
+            Task.objects.create(user=self.user, title=f"Task {index}", completed=False)
+
+        self.client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"{self.list_url}?count=false", format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertTrue(response.data["has_next"])
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertFalse(any("COUNT(" in query["sql"] for query in queries.captured_queries))
+
+        second_page = self.client.get(response.data["next"], format="json")
+        self.assertFalse(second_page.data["has_next"])
+        self.assertEqual(len(second_page.data["results"]), 3)
+
+    @override_settings(TASK_COUNT_STRATEGY="cached")
+    @shared_cache
+    def test_cached_count_is_reused_and_invalidated_on_write(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        first_response = self.client.get(self.list_url, format="json")
+        self.assertEqual(first_response.data["count"], 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            cached_response = self.client.get(self.list_url, format="json")
+        self.assertEqual(cached_response.data["count"], 1)
+        self.assertFalse(any("COUNT(" in query["sql"] for query in queries.captured_queries))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(user=self.user, title="Fresh Task", completed=False)
+        refreshed_response = self.client.get(self.list_url, format="json")
+        self.assertEqual(refreshed_response.data["count"], 2)
+
+    @override_settings(TASK_COUNT_STRATEGY="cached")
+    def test_cached_count_falls_back_to_exact_with_a_per_process_cache(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.list_url, format="json")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, format="json")
+        self.assertEqual(response.data["count"], 1)
+        self.assertTrue(any("COUNT(" in query["sql"] for query in queries.captured_queries))
+
+    def test_search_matches_description_and_tags_ranked(self) -> None:
+        Task.objects.create(user=self.user, title="Weekly report", description="Quarterly numbers")
+        Task.objects.create(
+            user=self.user,
+            title="Quarterly review",
+            description="Quarterly planning for the quarterly offsite",
+            tags="quarterly",
+        )
+        Task.objects.create(user=self.user, title="Plan sprint", tags="planning")
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(f"{self.list_url}?search=quarter", format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["results"][0]["title"], "Quarterly review")
+
+    def test_search_index_follows_task_updates_and_deletes(self) -> None:
+        task = Task.objects.create(user=self.user, title="Buy groceries")
+        self.client.force_authenticate(user=self.user)
+
+        task.title = "Book flights"
+        task.save()
+        self.assertEqual(self.client.get(f"{self.list_url}?search=groceries").data["count"], 0)
+        self.assertEqual(self.client.get(f"{self.list_url}?search=flights").data["count"], 1)
+
+        task.delete()
+        self.assertEqual(self.client.get(f"{self.list_url}?search=flights").data["count"], 0)
+
+    def test_sqlite_search_needs_the_index_triggers(self) -> None:
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite full-text search only.")
+        self.addCleanup(search._sqlite_search_indexes.clear)
+        search._sqlite_search_indexes.clear()
+        self.assertEqual(search.get_search_backend("default"), "sqlite")
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER {search.SQLITE_SEARCH_TABLE}_au")
+        search._sqlite_search_indexes.clear()
+        self.assertEqual(search.get_search_backend("default"), "ilike")
+
+    def test_jwt_request_resolves_user_type_with_the_user_lookup(self) -> None:
+        access_token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.detail_url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as queries:
+            list_response = self.client.get(self.list_url, format="json")
+        self.assertEqual(list_response.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any('FROM "users_usertype"' in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_bulk_create_tasks_in_one_insert(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        payload = [
+            {"title": "Plan sprint"},
+            {"title": "Review PRs", "completed": True, "priority": "HIGH"},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("v1:task-bulk"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item["status"] for item in response.data["results"]], ["created", "created"])
+        self.assertEqual(len([q for q in queries.captured_queries if q["sql"].startswith("INSERT")]), 1)
+        self.assertIsNone(response.data["results"][0]["task"]["completed_at"])
+        self.assertIsNotNone(response.data["results"][1]["task"]["completed_at"])
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 3)
+
+    def test_bulk_create_under_stateless_auth_does_not_load_the_user(self) -> None:
+        claims_user = ClaimsUser(UserClaimsRefreshToken.for_user(self.user).access_token)
+        self.client.force_authenticate(user=claims_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("v1:task-bulk"), [{"title": "Claims"}], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["results"][0]["task"]["user_name"], "owner@example.com")
+        self.assertFalse(any('FROM "users_user"' in query["sql"] for query in queries.captured_queries))
+
+    def test_bulk_create_is_all_or_nothing(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        payload = [{"title": "Valid"}, {"title": "   "}]
+        response = self.client.post(reverse("v1:task-bulk"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([item["status"] for item in response.data["results"]], ["skipped", "invalid"])
+        self.assertIn("title", response.data["results"][1]["errors"])
+        self.assertFalse(Task.objects.filter(title="Valid").exists())
+
+    @override_settings(TASK_BULK_MAX_OPERATIONS=2)
+    def test_bulk_rejects_too_many_operations(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        payload = [{"title": f"Task {index}"} for index in range(3)]
+        response = self.client.post(reverse("v1:task-bulk"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", response.data["errors"])
+
+    def test_bulk_update_tasks(self) -> None:
+        second_task = Task.objects.create(user=self.user, title="Second", completed=True)
+        self.client.force_authenticate(user=self.user)
+        payload = [
+            {"id": self.user_task.id, "title": "Done now", "completed": True},
+            {"id": second_task.id, "title": "Reopened", "completed": False},
+        ]
+        response = self.client.put(reverse("v1:task-bulk"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["status"] for item in response.data["results"]], ["updated", "updated"])
+        self.user_task.refresh_from_db()
+        second_task.refresh_from_db()
+        self.assertEqual(self.user_task.title, "Done now")
+        self.assertIsNotNone(self.user_task.completed_at)
+        self.assertGreater(self.user_task.updated_at, self.user_task.created_at)
+        self.assertIsNone(second_task.completed_at)
+
+    def test_bulk_update_reports_foreign_and_missing_tasks(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        payload = [
+            {"id": self.user_task.id, "title": "Mine"},
+            {"id": self.other_task.id, "title": "Not mine"},
+            {"id": 999999, "title": "Missing"},
+            {"title": "No id"},
+        ]
+        response = self.client.put(reverse("v1:task-bulk"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [item["status"] for item in response.data["results"]],
+            ["skipped", "forbidden", "not_found", "invalid"],
+        )
+        self.user_task.refresh_from_db()
+        self.assertEqual(self.user_task.title, "Owner Task")
+
+    def test_bulk_delete_tasks(self) -> None:
+        second_task = Task.objects.create(user=self.user, title="Second")
+        self.client.force_authenticate(user=self.user)
+        response = self.client.delete(
+            reverse("v1:task-bulk"), [self.user_task.id, second_task.id], format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["status"] for item in response.data["results"]], ["deleted", "deleted"])
+        self.assertFalse(Task.objects.filter(user=self.user).exists())
+
+        forbidden = self.client.delete(reverse("v1:task-bulk"), [self.other_task.id], format="json")
+        self.assertEqual(forbidden.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(Task.objects.filter(id=self.other_task.id).exists())
+
+    def test_bulk_delete_query_count_does_not_grow_with_tasks(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        query_counts = []
+        for size in (2, 50):
+            tasks = Task.objects.bulk_create(Task(user=self.user, title=f"Task {index}") for index in range(size))
+            rebuild_task_stats([self.user.id])
+            with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(reverse("v1:task-bulk"), [task.id for task in tasks], format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            query_counts.append(len(queries.captured_queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+        self.assertEqual(DeletedTask.objects.filter(user=self.user).count(), 52)
+        self.assertEqual(TaskStats.objects.get(user=self.user).total, 1)
+
+    def test_admin_can_bulk_update_any_task(self) -> None:
+        self.client.force_authenticate(user=self.admin_user)
+        payload = [{"id": self.other_task.id, "title": "Admin edit", "completed": True}]
+        response = self.client.put(reverse("v1:task-bulk"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.other_task.refresh_from_db()
+        self.assertEqual(self.other_task.title, "Admin edit")
+
+    def test_task_detail_returns_304_when_unchanged(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.detail_url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", response)
+
+        not_modified = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+        self.user_task.title = "Renamed"
+        self.user_task.save()
+        changed = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed["ETag"], response["ETag"])
+
+    @shared_cache
+    def test_task_list_returns_304_without_querying_tasks(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.list_url, format="json")
+        etag = response["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            not_modified = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries.captured_queries), 0)
+
+        other_page = self.client.get(f"{self.list_url}?completed=true", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other_page.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(user=self.other_user, title="Unrelated")
+        self.assertEqual(
+            self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(user=self.user, title="New Owner Task")
+        self.assertEqual(
+            self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_200_OK,
+        )
+
+    @override_settings(TASK_LIST_CACHE_TTL=60)
+    @shared_cache
+    def test_task_list_serves_cached_page_until_write(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        first_response = self.client.get(self.list_url, format="json")
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(self.list_url, format="json")
+        self.assertEqual(cached_response.data, first_response.data)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(user=self.user, title="Fresh Task")
+            # Not committed yet, so the cached page is still current.
+            self.assertEqual(self.client.get(self.list_url, format="json").data, first_response.data)
+        self.assertEqual(self.client.get(self.list_url, format="json").data["count"], 2)
+
+    @override_settings(TASK_LIST_CACHE_TTL=60)
+    def test_task_list_is_not_cached_or_revalidated_with_a_per_process_cache(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        self.assertFalse(self.client.get(self.list_url, format="json").has_header("ETag"))
+        # Another worker's write would not bump this process's version, so nothing may be served from it.
+        with self.assertNumQueries(2):
+            self.client.get(self.list_url, format="json")
+
+    @override_settings(TASK_LIST_CACHE_TTL=60)
+    @shared_cache
+    def test_overdue_list_is_not_cached_or_revalidated(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        task = Task.objects.create(user=self.user, title="Due Soon", due_date=timezone.now() + timedelta(minutes=1))
+        response = self.client.get(self.list_url, {"overdue": "true"}, format="json")
+        self.assertEqual(response.data["count"], 0)
+        self.assertFalse(response.has_header("ETag"))
+
+        # The due date passing is not a write, so no task version changes.
+        Task.objects.filter(pk=task.pk).update(due_date=timezone.now() - timedelta(minutes=1))
+        response = self.client.get(self.list_url, {"overdue": "true"}, format="json", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+
+    def test_read_serializer_renders_identical_json(self) -> None:
+        named_user = User.objects.create_user(
+            email="named@example.com",
+            password=self.password,
+            first_name="Ada",
+            last_name="Lovelace",
+            user_type=self.user.user_type,
+        )
+        Task.objects.create(
+            user=named_user,
+            title="Timed",
+            completed=True,
+            priority=Task.PriorityChoices.HIGH,
+            due_date=timezone.now(),
+            estimated_time=90,
+            tags="a,b",
+        )
+        queryset = Task.objects.select_related("user").order_by("id")
+        renderer = JSONRenderer()
+
+        for zone in ("UTC", "Asia/Kolkata"):
+            with timezone.override(zone):
+                expected = renderer.render(TaskSerializer(queryset, many=True).data)
+                actual = renderer.render(
+                    TaskReadSerializer(TaskReadSerializer.get_values(queryset), many=True).data
+                )
+                self.assertEqual(actual, expected)
+
+    def test_task_list_annotates_user_name_without_loading_user_rows(self) -> None:
+        self.user.first_name = "Olive"
+        self.user.save()
+        self.client.force_authenticate(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, format="json")
+        self.assertEqual(response.data["results"][0]["user_name"], "Olive")
+        self.assertFalse(any('"password"' in query["sql"] for query in queries.captured_queries))
+
+        self.client.force_authenticate(user=self.other_user)
+        other_response = self.client.get(self.list_url, format="json")
+        self.assertEqual(other_response.data["results"][0]["user_name"], "other@example.com")
+
+    def test_sparse_fieldsets_trim_output_and_selected_columns(self) -> None:
+        self.client.force_authenticate(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"{self.list_url}?fields=id,title,status,due_date&count=false", format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"],
+            [{"id": self.user_task.id, "title": "Owner Task", "status": "PENDING", "due_date": None}],
+        )
+        sql = queries.captured_queries[-1]["sql"]
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn("JOIN", sql)
+
+        response = self.client.get(f"{self.detail_url}?omit=description,user_name", format="json")
+        self.assertNotIn("description", response.data)
+        self.assertNotIn("user_name", response.data)
+        self.assertEqual(response.data["title"], "Owner Task")
+
+        full = self.client.get(self.detail_url, format="json")
+        self.assertNotEqual(full["ETag"], response["ETag"])
+
+        response = self.client.get(f"{self.list_url}?fields=id,secret", format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)
+
+    def test_sparse_fieldsets_keep_cursor_pagination_working(self) -> None:
+        for index in range(11):
+            Task.objects.create(user=self.user, title=f"Extra {index}")
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(f"{self.list_url}?cursor=&fields=title", format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data["results"][0]), {"title"})
+        response = self.client.get(response.data["next"], format="json")
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(set(response.data["results"][0]), {"title"})
+
+    def test_async_detail_honours_sparse_fieldsets(self) -> None:
+        response = self.call_async_view(
+            AsyncTaskDetailAPIView,
+            "get",
+            self.user,
+            f"{self.detail_url}?fields=id,title",
+            task_id=self.user_task.id,
+        )
+        self.assertEqual(response.data, {"id": self.user_task.id, "title": "Owner Task"})
+
+    def assert_stats_match_tasks(self) -> None:
+        expected = {stats.user_id: stats for stats in TaskStats.objects.all()}
+        rebuild_task_stats()
+        for stats in TaskStats.objects.all():
+            current = expected.pop(stats.user_id)
+            for field in TaskStats.counter_fields():
+                self.assertEqual(getattr(current, field), getattr(stats, field), (stats.user_id, field))
+        self.assertEqual(expected, {})
+
+    def test_task_stats_follow_single_task_writes(self) -> None:
+        stats_url = reverse("v1:task-stats")
+        Task.objects.create(
+            user=self.user,
+            title="Late",
+            priority=Task.PriorityChoices.HIGH,
+            due_date=timezone.now() - timedelta(days=1),
+            estimated_time=30,
+        )
+        self.user_task.completed = True
+        self.user_task.status = Task.StatusChoices.COMPLETED
+        self.user_task.estimated_time = 45
+        self.user_task.save()
+        self.client.force_authenticate(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(stats_url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "total": 2,
+                "completed": 1,
+                "overdue": 1,
+                "estimated_time": 75,
+                "by_status": {"PENDING": 1, "IN_PROGRESS": 0, "COMPLETED": 1, "CANCELLED": 0},
+                "by_priority": {"LOW": 0, "MEDIUM": 1, "HIGH": 1},
+            },
+        )
+        self.assertEqual(len(queries.captured_queries), 2)
+        self.assert_stats_match_tasks()
+
+        self.user_task.delete()
+        response = self.client.get(stats_url, format="json")
+        self.assertEqual(response.data["total"], 1)
+        self.assertEqual(response.data["estimated_time"], 30)
+        self.assert_stats_match_tasks()
+
+    def test_task_stats_follow_bulk_writes_and_admin_scope(self) -> None:
+        stats_url = reverse("v1:task-stats")
+        self.client.force_authenticate(user=self.user)
+        created = self.client.post(
+            reverse("v1:task-bulk"),
+            [{"title": "A", "priority": "LOW"}, {"title": "B", "estimated_time": 10}],
+            format="json",
+        )
+        ids = [item["id"] for item in created.data["results"]]
+        self.client.put(
+            reverse("v1:task-bulk"),
+            [{"id": ids[0], "title": "A", "completed": True, "status": "COMPLETED", "estimated_time": 5}],
+            format="json",
+        )
+        self.assert_stats_match_tasks()
+        self.client.delete(reverse("v1:task-bulk"), [ids[1]], format="json")
+        self.assert_stats_match_tasks()
+
+        response = self.client.get(stats_url, format="json")
+        self.assertEqual(response.data["total"], 2)
+        self.assertEqual(response.data["by_priority"]["LOW"], 1)
+        self.assertEqual(response.data["estimated_time"], 5)
+
+        self.client.force_authenticate(user=self.admin_user)
+        self.assertEqual(self.client.get(stats_url, format="json").data["total"], 3)
+        response = self.client.get(f"{stats_url}?user_id={self.other_user.id}", format="json")
+        self.assertEqual(response.data["completed"], 1)
+        response = self.client.get(f"{stats_url}?user_id=abc", format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_stats_and_changes_reject_the_same_invalid_user_id(self) -> None:
+        self.client.force_authenticate(user=self.admin_user)
+        for url, message in (
+            (reverse("v1:task-stats"), "Invalid stats request."),
+            (reverse("v1:task-changes"), "Invalid change request."),
+        ):
+            response = self.client.get(url, {"user_id": "abc"}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(
+                response.data, {"message": message, "errors": {"user_id": ["A valid integer is required."]}}
+            )
+
+    def test_rebuild_task_stats_command_repairs_drift(self) -> None:
+        TaskStats.objects.filter(user=self.user).update(total=99)
+        TaskStats.objects.filter(user=self.other_user).delete()
+        Task.objects.filter(id=self.user_task.id).update(priority=Task.PriorityChoices.HIGH)
+
+        call_command("rebuild_task_stats", stdout=StringIO())
+
+        self.assertEqual(TaskStats.objects.get(user=self.user).total, 1)
+        self.assertEqual(TaskStats.objects.get(user=self.user).priority_high, 1)
+        self.assertEqual(TaskStats.objects.get(user=self.other_user).completed, 1)
+
+    def test_drifted_stats_do_not_block_task_deletes(self) -> None:
+        # update() skips the signals, so the counters no longer match the task being deleted.
+        Task.objects.filter(id=self.user_task.id).update(estimated_time=500, priority=Task.PriorityChoices.HIGH)
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.delete(self.detail_url)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        stats = TaskStats.objects.get(user=self.user)
+        self.assertEqual((stats.total, stats.estimated_time, stats.priority_high), (0, 0, 0))
+
+    @override_settings(TASK_CHANGES_SAFETY_LAG_SECONDS=0)
+    def test_change_feed_returns_updates_and_tombstones_since_token(self) -> None:
+        changes_url = reverse("v1:task-changes")
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(changes_url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task["id"] for task in response.data["changes"]], [self.user_task.id])
+        self.assertEqual(response.data["deleted"], [])
+        self.assertFalse(response.data["has_more"])
+        token = response.data["next"]
+
+        response = self.client.get(changes_url, {"since": token}, format="json")
+        self.assertEqual((response.data["changes"], response.data["deleted"]), ([], []))
+
+        created = Task.objects.create(user=self.user, title="New")
+        self.user_task.delete()
+        Task.objects.create(user=self.other_user, title="Foreign")
+        self.other_task.delete()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(changes_url, {"since": token, "fields": "id,title"}, format="json")
+        self.assertEqual(response.data["changes"], [{"id": created.id, "title": "New"}])
+        self.assertEqual(response.data["deleted"], [self.user_task_id])
+        self.assertEqual(len(queries.captured_queries), 2)
+
+        response = self.client.get(changes_url, {"since": response.data["next"]}, format="json")
+        self.assertEqual((response.data["changes"], response.data["deleted"]), ([], []))
+
+    @override_settings(TASK_CHANGES_SAFETY_LAG_SECONDS=60)
+    def test_change_feed_token_stays_behind_recent_writes(self) -> None:
+        changes_url = reverse("v1:task-changes")
+        self.client.force_authenticate(user=self.user)
+        token = self.client.get(changes_url, format="json").data["next"]
+        self.user_task.delete()
+
+        # Both the task write and the tombstone are inside the lag window, so they are sent again.
+        response = self.client.get(changes_url, {"since": token}, format="json")
+        self.assertEqual(response.data["deleted"], [self.user_task_id])
+        response = self.client.get(changes_url, {"since": response.data["next"]}, format="json")
+        self.assertEqual(response.data["deleted"], [self.user_task_id])
+
+        # A tombstone committed late with an older id is still picked up.
+        late = DeletedTask.objects.create(task_id=999, user=self.user)
+        DeletedTask.objects.filter(task_id=self.user_task_id).update(id=late.id + 1)
+        response = self.client.get(changes_url, {"since": response.data["next"]}, format="json")
+        self.assertEqual(response.data["deleted"], [999, self.user_task_id])
+
+        DeletedTask.objects.update(deleted_at=timezone.now() - timedelta(minutes=5))
+        response = self.client.get(changes_url, {"since": response.data["next"]}, format="json")
+        response = self.client.get(changes_url, {"since": response.data["next"]}, format="json")
+        self.assertEqual((response.data["changes"], response.data["deleted"]), ([], []))
+
+    @override_settings(TASK_CHANGES_PAGE_SIZE=2)
+    def test_change_feed_pages_through_changes(self) -> None:
+        changes_url = reverse("v1:task-changes")
+        for index in range(4):
+            Task.objects.create(user=self.user, title=f"Task {index}")
+        Task.objects.filter(user=self.user).update(updated_at=self.user_task.updated_at)
+        self.client.force_authenticate(user=self.user)
+
+        seen, params = [], {}
+        while True:
+            response = self.client.get(changes_url, params, format="json")
+            seen.extend(task["id"] for task in response.data["changes"])
+            params = {"since": response.data["next"]}
+            if not response.data["has_more"]:
+                break
+        self.assertEqual(seen, sorted(Task.objects.filter(user=self.user).values_list("id", flat=True)))
+
+    def test_change_feed_rejects_invalid_and_expired_tokens(self) -> None:
+        changes_url = reverse("v1:task-changes")
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(changes_url, {"since": "not-a-token"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        expired = ChangeToken(
+            updated_at=None,
+            task_id=0,
+            tombstone_id=0,
+            issued_at=timezone.now() - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS + 1),
+        )
+        response = self.client.get(changes_url, {"since": expired.encode()}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_prune_task_tombstones_command_drops_old_tombstones(self) -> None:
+        self.user_task.delete()
+        self.other_task.delete()
+        DeletedTask.objects.filter(task_id=self.other_task_id).update(
+            deleted_at=timezone.now() - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS + 1)
+        )
+
+        call_command("prune_task_tombstones", stdout=StringIO())
+        self.assertEqual(list(DeletedTask.objects.values_list("task_id", flat=True)), [self.user_task_id])
+
+    def call_async_view(self, view_class, method, user, path, data=None, **kwargs):
+        request = getattr(APIRequestFactory(), method)(path, data, format="json")
+        force_authenticate(request, user=user)
+        return async_to_sync(view_class.as_view())(request, **kwargs)
+
+    @override_settings(TASK_EVENT_BROKER="apps.tasks.tests.RecordingTaskEventBroker")
+    def test_task_writes_publish_events_after_commit(self) -> None:
+        broker = get_task_event_broker()
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(user=self.user, title="Evented")
+            self.assertEqual(broker.published, [])
+        with self.captureOnCommitCallbacks(execute=True):
+            task.title = "Renamed"
+            task.save()
+            task_id = task.id
+            task.delete()
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("v1:task-bulk"), [{"title": "Bulk"}], format="json")
+
+        self.assertEqual(
+            [(event["type"], event["id"]) for event in broker.published[:3]],
+            [("created", task_id), ("updated", task_id), ("deleted", task_id)],
+        )
+        self.assertEqual(broker.published[3]["type"], "created")
+        self.assertEqual({event["user_id"] for event in broker.published}, {self.user.id})
+
+    def test_event_stream_pushes_own_events_and_all_events_to_admins(self) -> None:
+        url = reverse("v1:task-events")
+        broker = get_task_event_broker()
+
+        async def read_events(user, count):
+            request = AsyncRequestFactory().get(url)
+            force_authenticate(request, user=user)
+            response = await TaskEventsAPIView.as_view()(request)
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            chunks = response.streaming_content
+            received = [await anext(chunks)]
+            broker.publish({"type": "updated", "id": self.other_task.id, "user_id": self.other_user.id})
+            broker.publish({"type": "deleted", "id": self.user_task.id, "user_id": self.user.id})
+            for _ in range(count):
+                received.append(await anext(chunks))
+            await chunks.aclose()
+            return received
+
+        received = async_to_sync(read_events)(self.user, 1)
+        self.assertEqual(received[0], b"retry: 5000\n\n")
+        self.assertEqual(
+            received[1],
+            f'event: deleted\ndata: {{"id":{self.user_task.id},"user_id":{self.user.id}}}\n\n'.encode(),
+        )
+
+        received = async_to_sync(read_events)(self.admin_user, 2)
+        self.assertEqual([chunk.split(b"\n")[0] for chunk in received[1:]], [b"event: updated", b"event: deleted"])
+
+    def test_event_stream_unsubscribes_on_close_and_needs_asgi(self) -> None:
+        broker = get_task_event_broker()
+
+        async def open_and_close():
+            unread = TaskEventsAPIView().stream(self.user.id)
+            self.assertEqual(broker.subscriptions, set())
+            await unread.aclose()
+
+            stream = TaskEventsAPIView().stream(self.user.id)
+            await anext(stream)
+            self.assertEqual(len(broker.subscriptions), 1)
+            await stream.aclose()
+
+        async_to_sync(open_and_close)()
+        self.assertEqual(broker.subscriptions, set())
+
+        response = self.call_async_view(TaskEventsAPIView, "get", self.user, reverse("v1:task-events"))
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    def test_async_task_list_matches_sync_list(self) -> None:
+        Task.objects.create(user=self.user, title="Second Owner Task", completed=True)
+        self.client.force_authenticate(user=self.user)
+
+        for query in ("", "?completed=true", "?count=false", "?cursor=", "?search=owner"):
+            sync_response = self.client.get(f"{self.list_url}{query}", format="json")
+            async_response = self.call_async_view(
+                AsyncTaskListCreateAPIView, "get", self.user, f"{self.list_url}{query}"
+            )
+            self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+            self.assertEqual(async_response.data, sync_response.data)
+
+        admin_response = self.call_async_view(
+            AsyncTaskListCreateAPIView, "get", self.admin_user, f"{self.list_url}?user_id={self.other_user.id}"
+        )
+        self.assertEqual([task["id"] for task in admin_response.data["results"]], [self.other_task.id])
+
+    def test_async_task_create_and_detail_keep_permissions(self) -> None:
+        created = self.call_async_view(
+            AsyncTaskListCreateAPIView, "post", self.user, self.list_url, {"title": "Async", "completed": True}
+        )
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertIsNotNone(created.data["task"]["completed_at"])
+
+        task_id = created.data["task"]["id"]
+        detail = self.call_async_view(AsyncTaskDetailAPIView, "get", self.user, self.list_url, task_id=task_id)
+        self.assertEqual(detail.data["title"], "Async")
+
+        forbidden = self.call_async_view(
+            AsyncTaskDetailAPIView, "put", self.other_user, self.list_url, {"title": "Nope"}, task_id=task_id
+        )
+        self.assertEqual(forbidden.status_code, status.HTTP_403_FORBIDDEN)
+
+        updated = self.call_async_view(
+            AsyncTaskDetailAPIView, "put", self.admin_user, self.list_url, {"title": "Admin"}, task_id=task_id
+        )
+        self.assertEqual(updated.status_code, status.HTTP_200_OK)
+        self.assertEqual(updated.data["task"]["user_name"], "owner@example.com")
+
+        deleted = self.call_async_view(AsyncTaskDetailAPIView, "delete", self.user, self.list_url, task_id=task_id)
+        self.assertEqual(deleted.status_code, status.HTTP_204_NO_CONTENT)
+        missing = self.call_async_view(AsyncTaskDetailAPIView, "get", self.user, self.list_url, task_id=task_id)
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    @shared_cache
+    @override_settings(TASK_COUNT_STRATEGY="cached")
+    def test_async_reads_load_the_user_type_off_the_event_loop(self) -> None:
+        # A freshly loaded user has not fetched user_type yet, so the permission checks query for it.
+        user = User.objects.get(pk=self.user.pk)
+        listed = self.call_async_view(AsyncTaskListCreateAPIView, "get", user, self.list_url)
+        self.assertEqual(listed.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", listed)
+
+        user = User.objects.get(pk=self.user.pk)
+        detail = self.call_async_view(
+            AsyncTaskDetailAPIView, "get", user, self.list_url, task_id=self.user_task.id
+        )
+        self.assertEqual(detail.status_code, status.HTTP_200_OK)
+
+    def test_async_writes_run_database_validators_off_the_event_loop(self) -> None:
+        def validate_title(serializer, value):
+            Task.objects.filter(title=value).exists()
+            return value
+
+        task_id = self.user_task.id
+        with mock.patch.object(TaskSerializer, "validate_title", validate_title):
+            created = self.call_async_view(
+                AsyncTaskListCreateAPIView, "post", self.user, self.list_url, {"title": "Validated"}
+            )
+            updated = self.call_async_view(
+                AsyncTaskDetailAPIView, "put", self.user, self.list_url, {"title": "Checked"}, task_id=task_id
+            )
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(updated.status_code, status.HTTP_200_OK)
+
+    def test_tags_are_normalized_on_write(self) -> None:
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.list_url, {"title": "Tagged", "tags": "Work, urgent,work"}, format="json")
+        self.assertEqual(response.data["task"]["tags"], "Work, urgent,work")
+
+        task = Task.objects.get(id=response.data["task"]["id"])
+        self.assertEqual(sorted(task.normalized_tags.values_list("name", flat=True)), ["urgent", "work"])
+
+        self.client.put(
+            reverse("v1:task-detail", kwargs={"task_id": task.id}), {"title": "Tagged", "tags": "home"}, format="json"
+        )
+        self.assertEqual(list(task.normalized_tags.values_list("name", flat=True)), ["home"])
+
+        bulk = self.client.post(reverse("v1:task-bulk"), [{"title": "Bulk", "tags": "home,errands"}], format="json")
+        bulk_task = Task.objects.get(id=bulk.data["results"][0]["id"])
+        self.assertEqual(sorted(bulk_task.normalized_tags.values_list("name", flat=True)), ["errands", "home"])
+        self.assertEqual(Tag.objects.filter(name="home").count(), 1)
+
+    def test_filter_tasks_by_any_or_all_tags(self) -> None:
+        both = Task.objects.create(user=self.user, title="Both", tags="work,urgent")
+        work = Task.objects.create(user=self.user, title="Work only", tags="work")
+        Task.objects.create(user=self.other_user, title="Foreign", tags="work,urgent")
+        self.client.force_authenticate(user=self.user)
+
+        any_response = self.client.get(f"{self.list_url}?tags=urgent,WORK", format="json")
+        self.assertEqual({task["id"] for task in any_response.data["results"]}, {both.id, work.id})
+
+        all_response = self.client.get(f"{self.list_url}?tags=urgent,work&tags_match=all", format="json")
+        self.assertEqual([task["id"] for task in all_response.data["results"]], [both.id])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(f"{self.list_url}?tags=work&count=false", format="json")
+        self.assertEqual(len(queries.captured_queries), 1)
+
+    def test_deleting_a_task_removes_its_tag_links(self) -> None:
+        task = Task.objects.create(user=self.user, title="Tagged", tags="work")
+        task.delete()
+        self.assertFalse(TaskTag.objects.exists())
+
+
+class SQLitePragmaTests(TestCase):
+
+    def test_new_connections_apply_the_pragma_profile(self) -> None:
+        if connection.vendor != "sqlite" or "busy_timeout" not in settings.SQLITE_PRAGMAS:
+            self.skipTest("SQLite busy_timeout profile not configured.")
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], int(settings.SQLITE_PRAGMAS["busy_timeout"]))
+
+    def test_invalid_pragma_values_are_rejected(self) -> None:
+        with self.assertRaises(ImproperlyConfigured):
+            get_pragma_statements({"journal_mode": "WAL; DROP TABLE tasks_task"})
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], DB_REPLICA_PIN_SECONDS=60)
+class ReadReplicaRoutingTests(SimpleTestCase):
+
+    class StubUser:
+        is_authenticated = True
+
+        def __init__(self, user_id: int) -> None:
+            self.id = user_id
+
+    def setUp(self) -> None:
+        self.enterContext(shared_cache_settings())
+        self.router = PrimaryReplicaRouter()
+
+    def dispatch(self, method: str, user) -> list[str]:
+        aliases = []
+
+        def view(request):
+            aliases.append(self.router.db_for_read(Task))
+            request.user = user
+            aliases.append(self.router.db_for_read(Task))
+            return HttpResponse()
+
+        request = getattr(RequestFactory(), method)("/api/v1/tasks/")
+        request.user = SimpleLazyObject(AnonymousUser)
+        replica_routing_middleware(view)(request)
+        return aliases
+
+    def test_reads_outside_requests_use_the_primary(self) -> None:
+        self.assertEqual(self.router.db_for_read(Task), "default")
+        self.assertEqual(self.router.db_for_write(Task), "default")
+
+    def test_authenticated_get_reads_from_replica(self) -> None:
+        self.assertEqual(self.dispatch("get", self.StubUser(1)), ["default", "replica"])
+
+    def test_user_reads_own_writes_from_primary(self) -> None:
+        self.assertEqual(self.dispatch("post", self.StubUser(1)), ["default", "default"])
+        self.assertEqual(self.dispatch("get", self.StubUser(1)), ["default", "default"])
+        self.assertEqual(self.dispatch("get", self.StubUser(2)), ["default", "replica"])
+
+    def test_replicas_refuse_a_per_process_cache(self) -> None:
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+            with self.assertRaises(ImproperlyConfigured):
+                self.dispatch("post", self.StubUser(1))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_the_primary(self) -> None:
+        self.assertEqual(self.dispatch("get", self.StubUser(1)), ["default", "default"])
+
+
+class RequestMetricsTests(APITestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+        for metric in METRICS:
+            metric.clear()
+        self.user = User.objects.create_user(email="metrics@example.com", password="StrongPass123!")
+        Task.objects.create(user=self.user, title="Measured task")
+        self.client.force_authenticate(user=self.user)
+        self.list_url = reverse("v1:task-list-create")
+
+    @override_settings(SERVER_TIMING_HEADER=True)
+    def test_server_timing_reports_database_and_serializer_time(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r"^total;dur=[\d.]+, db;dur=[\d.]+;desc=\"\d+ queries\", serializer;dur=[\d.]+$")
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+
+    def test_metrics_endpoint_exposes_histograms_per_url_name(self) -> None:
+        self.client.get(self.list_url, format="json")
+        self.assertFalse(self.client.get(self.list_url, format="json").has_header("Server-Timing"))
+
+        self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_403_FORBIDDEN)
+
+        staff = User.objects.create_user(
+            email="metrics-staff@example.com", user_type=UserType.objects.get(code=UserType.STAFF)
+        )
+        self.client.force_login(staff)
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        labels = 'view="v1:task-list-create",method="GET"'
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2', body)
+        self.assertIn(f"http_request_duration_seconds_count{{{labels}}} 2", body)
+        self.assertIn(f'http_requests_total{{{labels},status="200"}} 2', body)
+        self.assertIn(f"http_response_size_bytes_count{{{labels}}} 2", body)
+        self.assertIn(f"http_request_db_queries_count{{{labels}}} 2", body)
+        self.assertIn(f"http_request_serializer_duration_seconds_count{{{labels}}} 2", body)
+
+    @override_settings(REQUEST_METRICS_TOKEN="scrape-secret")
+    def test_metrics_endpoint_can_require_a_token(self) -> None:
+        self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0.001)
+    def test_slow_requests_are_logged_with_their_sql(self) -> None:
+        with self.assertLogs("config.middleware", "WARNING") as logs:
+            self.client.get(self.list_url, format="json")
+
+        self.assertIn("Slow request GET /api/v1/tasks/ (v1:task-list-create)", logs.output[0])
+        self.assertIn('FROM "tasks_task"', logs.output[0])
+
+    def test_render_metrics_escapes_label_values(self) -> None:
+        METRICS[0].inc(('say "hi"\n', "GET", 200))
+        self.assertIn('view="say \\"hi\\"\\n"', render_metrics())
@@ -1,9 +1,27 @@
+from django.conf import settings
 from django.urls import path
 
-from .views import TaskDetailAPIView, TaskListCreateAPIView
+from .async_views import AsyncTaskDetailAPIView, AsyncTaskListCreateAPIView, TaskEventsAPIView
+from .views import (
+    TaskBulkAPIView,
+    TaskChangesAPIView,
+    TaskDetailAPIView,
+    TaskListCreateAPIView,
+    TaskStatsAPIView,
+)
+
+
+if settings.TASK_ASYNC_VIEWS:
+    list_create_view, detail_view = AsyncTaskListCreateAPIView, AsyncTaskDetailAPIView
+else:
+    list_create_view, detail_view = TaskListCreateAPIView, TaskDetailAPIView
 
 
 urlpatterns = [
-    path("", TaskListCreateAPIView.as_view(), name="task-list-create"),
-    path("<int:task_id>/", TaskDetailAPIView.as_view(), name="task-detail"),
+    path("", list_create_view.as_view(), name="task-list-create"),
+    path("bulk/", TaskBulkAPIView.as_view(), name="task-bulk"),
+    path("stats/", TaskStatsAPIView.as_view(), name="task-stats"),
+    path("changes/", TaskChangesAPIView.as_view(), name="task-changes"),
+    path("events/", TaskEventsAPIView.as_view(), name="task-events"),
+    path("<int:task_id>/", detail_view.as_view(), name="task-detail"),
 ]
@@ -1,31 +1,215 @@
 from __future__ import annotations
 
+from django.conf import settings
+from django.core.cache import cache
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
-from rest_framework import filters, status
-from rest_framework.exceptions import NotFound
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from config.cache import is_shared_cache
+
+from .cache import (
+    get_precondition_response,
+    get_task_scope,
+    get_task_version,
+    make_etag,
+    set_validators,
+)
+from .changes import ChangeToken, get_changes
 from .filters import TaskFilter
-from .models import Task
-from .pagination import TaskPagination
+from .models import DeletedTask, Task
+from .pagination import TaskCursorPagination, TaskPagination
 from .permissions import IsOwnerOrAdmin
-from .serializers import TaskSerializer
+from .search import TaskSearchFilter
+from .serializers import TaskReadSerializer, TaskSerializer
+from .signals import delete_tasks
+from .stats import get_task_stats
+
+
+sparse_fieldset_parameters = [
+    OpenApiParameter(
+        name="fields",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description="Comma-separated task fields to return, e.g. `id,title,status,due_date`.",
+    ),
+    OpenApiParameter(
+        name="omit",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description="Comma-separated task fields to leave out, e.g. `description`.",
+    ),
+]
+
+
+list_tasks_schema = extend_schema(
+    tags=["Tasks"],
+    description="List tasks for the authenticated user (or all tasks for admin users).",
+    parameters=[
+        OpenApiParameter(
+            name="completed",
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description="Filter tasks by completion status.",
+        ),
+        OpenApiParameter(
+            name="is_active",
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description="Filter tasks by active flag.",
+        ),
+        OpenApiParameter(
+            name="status__in",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Comma-separated statuses, e.g. `PENDING,IN_PROGRESS`.",
+        ),
+        OpenApiParameter(
+            name="priority__in",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Comma-separated priorities, e.g. `HIGH,MEDIUM`.",
+        ),
+        OpenApiParameter(
+            name="due_date_after",
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description="Only tasks due at or after this ISO 8601 datetime.",
+        ),
+        OpenApiParameter(
+            name="due_date_before",
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description="Only tasks due at or before this ISO 8601 datetime.",
+        ),
+        OpenApiParameter(
+            name="created_at_after",
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description="Only tasks created at or after this ISO 8601 datetime.",
+        ),
+        OpenApiParameter(
+            name="created_at_before",
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description="Only tasks created at or before this ISO 8601 datetime.",
+        ),
+        OpenApiParameter(
+            name="overdue",
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description="`true` for incomplete tasks past their due date, `false` for everything else.",
+        ),
+        OpenApiParameter(
+            name="tags",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Comma-separated tag names (case-insensitive).",
+        ),
+        OpenApiParameter(
+            name="tags_match",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            enum=["any", "all"],
+            description="Match tasks having `any` (default) or `all` of the given tags.",
+        ),
+        OpenApiParameter(
+            name="search",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=(
+                "Search tasks by title, description and tags. Words are prefix-matched "
+                "and results are ranked by relevance."
+            ),
+        ),
+        OpenApiParameter(
+            name="page",
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description="Page number for paginated results.",
+        ),
+        OpenApiParameter(
+            name="count",
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description="Pass `false` to skip the total count and return a `has_next` flag instead.",
+        ),
+        OpenApiParameter(
+            name="cursor",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=(
+                "Opaque cursor for keyset pagination. Pass an empty value to start "
+                "cursor mode, then follow the returned `next`/`previous` links."
+            ),
+        ),
+        OpenApiParameter(
+            name="user_id",
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description="Filter tasks by owner user id (admin/super admin only).",
+        ),
+        *sparse_fieldset_parameters,
+    ],
+    responses={200: TaskSerializer(many=True)},
+)
+
+
+create_task_schema = extend_schema(
+    tags=["Tasks"],
+    description="Create a new task for the authenticated user.",
+    request=TaskSerializer,
+    examples=[
+        OpenApiExample(
+            "Create task payload",
+            value={"title": "Finish report", "description": "Submit by EOD", "completed": False},
+            request_only=True,
+        )
+    ],
+    responses={201: TaskSerializer},
+)
+
+
+retrieve_task_schema = extend_schema(
+    tags=["Tasks"],
+    description="Retrieve a single task. Accessible by owner or admin.",
+    parameters=sparse_fieldset_parameters,
+    responses={200: TaskSerializer},
+)
+
+
+update_task_schema = extend_schema(
+    tags=["Tasks"],
+    description="Fully update a task. Accessible by owner or admin.",
+    request=TaskSerializer,
+    responses={200: TaskSerializer},
+)
+
+
+delete_task_schema = extend_schema(
+    tags=["Tasks"],
+    description="Delete a task. Accessible by owner or admin.",
+    responses={204: None},
+)
 
 
 class TaskListCreateAPIView(APIView):
 
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, TaskSearchFilter]
     filterset_class = TaskFilter
     search_fields = ["title"]
+    time_dependent_filters = {"overdue"}
 
     def get_queryset(self, request):
-        queryset = Task.objects.select_related("user").all()
+        queryset = Task.objects.all()
         if not request.user.has_global_data_access():
-            queryset = queryset.filter(user=request.user)
+            queryset = queryset.filter(user_id=request.user.id)
         return queryset
 
     def apply_filters(self, request, queryset):
@@ -33,72 +217,74 @@ class TaskListCreateAPIView(APIView):
             queryset = backend().filter_queryset(request, queryset, self)
         return queryset
 
-    @extend_schema(
-        tags=["Tasks"],
-        description="List tasks for the authenticated user (or all tasks for admin users).",
-        parameters=[
-            OpenApiParameter(
-                name="completed",
-                type=bool,
-                location=OpenApiParameter.QUERY,
-                description="Filter tasks by completion status.",
-            ),
-            OpenApiParameter(
-                name="search",
-                type=str,
-                location=OpenApiParameter.QUERY,
-                description="Search tasks by title.",
-            ),
-            OpenApiParameter(
-                name="page",
-                type=int,
-                location=OpenApiParameter.QUERY,
-                description="Page number for paginated results.",
-            ),
-            OpenApiParameter(
-                name="user_id",
-                type=int,
-                location=OpenApiParameter.QUERY,
-                description="Filter tasks by owner user id (admin/super admin only).",
-            ),
-        ],
-        responses={200: TaskSerializer(many=True)},
-    )
+    def get_paginator(self, request):
+        if TaskCursorPagination.cursor_query_param in request.query_params:
+            return TaskCursorPagination()
+        return TaskPagination()
+
+    @list_tasks_schema
     def get(self, request, *args, **kwargs):
+        etag = self.get_list_etag(request)
+        if etag is None:
+            return Response(self.get_page_data(request))
+        not_modified = get_precondition_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        page_cache_ttl = getattr(settings, "TASK_LIST_CACHE_TTL", 0)
+        page_cache_key = f"tasks:page:{etag}"
+        data = cache.get(page_cache_key) if page_cache_ttl else None
+        if data is None:
+            data = self.get_page_data(request)
+            if page_cache_ttl:
+                cache.set(page_cache_key, data, page_cache_ttl)
+        return set_validators(Response(data), etag)
+
+    def get_list_etag(self, request) -> str | None:
+        # Filters relative to the current time change results without a write, so such pages
+        # cannot be revalidated or cached against the task version. Neither can any page when the
+        # version lives in a per-process cache that writes handled by other workers never bump.
+        if self.time_dependent_filters & request.query_params.keys() or not is_shared_cache():
+            return None
+        scope = get_task_scope(request.user)
+        return make_etag("tasks", scope or "all", get_task_version(scope), request.build_absolute_uri())
+
+    def get_filtered_queryset(self, request, fields: tuple[str, ...] | None = None):
         queryset = self.get_queryset(request)
         user_id = request.query_params.get("user_id")
         if user_id and request.user.has_global_data_access():
             queryset = queryset.filter(user_id=user_id)
-        queryset = self.apply_filters(request, queryset)
+        return TaskReadSerializer.get_values(self.apply_filters(request, queryset), fields)
 
-        paginator = TaskPagination()
-        paginated_tasks = paginator.paginate_queryset(queryset, request, view=self)
-        serializer = TaskSerializer(paginated_tasks, many=True)
-        return paginator.get_paginated_response(serializer.data)
+    def get_page_data(self, request):
+        fields = TaskReadSerializer.get_requested_fields(request.query_params)
+        paginator = self.get_paginator(request)
+        paginated_tasks = paginator.paginate_queryset(
+            self.get_filtered_queryset(request, fields), request, view=self
+        )
+        serializer = TaskReadSerializer(paginated_tasks, many=True, fields=fields)
+        return paginator.get_paginated_response(serializer.data).data
 
-    @extend_schema(
-        tags=["Tasks"],
-        description="Create a new task for the authenticated user.",
-        request=TaskSerializer,
-        examples=[
-            OpenApiExample(
-                "Create task payload",
-                value={"title": "Finish report", "description": "Submit by EOD", "completed": False},
-                request_only=True,
-            )
-        ],
-        responses={201: TaskSerializer},
-    )
+    @create_task_schema
     def post(self, request, *args, **kwargs):
         serializer = TaskSerializer(data=request.data)
         if not serializer.is_valid():
-            return Response(
-                {"message": "Task creation failed.", "errors": serializer.errors},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        serializer.save(user=request.user)
+            return self.invalid_response(serializer)
+        return self.created_response(self.perform_create(request, serializer))
+
+    def perform_create(self, request, serializer):
+        serializer.save(user_id=request.user.id)
+        return serializer.data
+
+    def invalid_response(self, serializer) -> Response:
+        return Response(
+            {"message": "Task creation failed.", "errors": serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    def created_response(self, data) -> Response:
         return Response(
-            {"message": "Task created successfully.", "task": serializer.data},
+            {"message": "Task created successfully.", "task": data},
             status=status.HTTP_201_CREATED,
         )
 
@@ -109,51 +295,355 @@ class TaskDetailAPIView(APIView):
 
     def get_object(self, task_id: int) -> Task:
         try:
-            return Task.objects.select_related("user").get(id=task_id)
+            return Task.objects.with_user_name().get(id=task_id)
         except Task.DoesNotExist as exc:
             raise NotFound(detail="Task not found.") from exc
 
-    @extend_schema(
-        tags=["Tasks"],
-        description="Retrieve a single task. Accessible by owner or admin.",
-        responses={200: TaskSerializer},
-    )
+    def get_row(self, task_id: int, fields: tuple[str, ...] | None = None) -> dict:
+        row = TaskReadSerializer.get_values(Task.objects.filter(id=task_id), fields).first()
+        if row is None:
+            raise NotFound(detail="Task not found.")
+        return row
+
+    @retrieve_task_schema
     def get(self, request, task_id: int, *args, **kwargs):
-        task = self.get_object(task_id)
-        self.check_object_permissions(request, task)
-        serializer = TaskSerializer(task)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        fields = TaskReadSerializer.get_requested_fields(request.query_params)
+        return self.retrieve_response(request, self.get_row(task_id, fields), fields)
 
-    @extend_schema(
-        tags=["Tasks"],
-        description="Fully update a task. Accessible by owner or admin.",
-        request=TaskSerializer,
-        responses={200: TaskSerializer},
-    )
+    def retrieve_response(self, request, row: dict, fields: tuple[str, ...] | None = None):
+        self.check_object_permissions(request, Task(id=row["id"], user_id=row["user_id"]))
+
+        fields = fields or TaskReadSerializer.fields
+        etag = make_etag("task", row["id"], row["updated_at"].isoformat(), ",".join(fields))
+        not_modified = get_precondition_response(request, etag, row["updated_at"])
+        if not_modified is not None:
+            return not_modified
+
+        serializer = TaskReadSerializer(row, fields=fields)
+        return set_validators(
+            Response(serializer.data, status=status.HTTP_200_OK), etag, row["updated_at"]
+        )
+
+    @update_task_schema
     def put(self, request, task_id: int, *args, **kwargs):
         task = self.get_object(task_id)
         self.check_object_permissions(request, task)
 
         serializer = TaskSerializer(task, data=request.data)
         if not serializer.is_valid():
-            return Response(
-                {"message": "Task update failed.", "errors": serializer.errors},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+            return self.invalid_response(serializer)
+        return self.updated_response(self.perform_update(serializer))
 
-        serializer.save(user=task.user)
+    def perform_update(self, serializer):
+        serializer.save()
+        return serializer.data
+
+    def invalid_response(self, serializer) -> Response:
         return Response(
-            {"message": "Task updated successfully.", "task": serializer.data},
+            {"message": "Task update failed.", "errors": serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    def updated_response(self, data) -> Response:
+        return Response(
+            {"message": "Task updated successfully.", "task": data},
             status=status.HTTP_200_OK,
         )
 
-    @extend_schema(
-        tags=["Tasks"],
-        description="Delete a task. Accessible by owner or admin.",
-        responses={204: None},
-    )
+    @delete_task_schema
     def delete(self, request, task_id: int, *args, **kwargs):
         task = self.get_object(task_id)
         self.check_object_permissions(request, task)
         task.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TaskBulkAPIView(APIView):
+
+    permission_classes = [IsAuthenticated]
+
+    def get_max_operations(self) -> int:
+        return getattr(settings, "TASK_BULK_MAX_OPERATIONS", 100)
+
+    def get_owner_name(self, request) -> str:
+        # Same value as TaskReadSerializer.get_user_name, read from the token claims under stateless auth.
+        return request.user.get_full_name() or request.user.email
+
+    def get_operations_errors(self, data) -> dict | None:
+        if not isinstance(data, list):
+            message = f"Expected a list of items but got type \"{type(data).__name__}\"."
+        elif not data:
+            message = "This list may not be empty."
+        elif len(data) > self.get_max_operations():
+            message = f"Ensure this field has no more than {self.get_max_operations()} elements."
+        else:
+            return None
+        return {"non_field_errors": [message]}
+
+    def parse_task_id(self, value) -> int | None:
+        if isinstance(value, bool):
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def resolve_tasks(self, request, raw_ids) -> tuple[list[dict], dict[int, Task]]:
+        ids = [self.parse_task_id(value) for value in raw_ids]
+        tasks = Task.objects.with_user_name().in_bulk([task_id for task_id in ids if task_id])
+        global_access = request.user.has_global_data_access()
+
+        results, seen = [], set()
+        for raw_id, task_id in zip(raw_ids, ids):
+            task = tasks.get(task_id)
+            if task_id is None:
+                results.append({"id": raw_id, "status": "invalid", "errors": {"id": ["A valid task id is required."]}})
+            elif task_id in seen:
+                results.append({"id": task_id, "status": "invalid", "errors": {"id": ["Duplicate task id."]}})
+            elif task is None:
+                results.append({"id": task_id, "status": "not_found", "errors": {"detail": "Task not found."}})
+            elif not global_access and task.user_id != request.user.id:
+                results.append(
+                    {"id": task_id, "status": "forbidden", "errors": {"detail": IsOwnerOrAdmin.message}}
+                )
+            else:
+                results.append({"id": task_id, "status": "skipped"})
+            seen.add(task_id)
+        return results, tasks
+
+    def failed_response(self, message: str, errors, results=None) -> Response:
+        if isinstance(errors, dict):
+            return Response({"message": message, "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        results = results or [{} for _ in errors]
+        for result, item_errors in zip(results, errors):
+            if item_errors:
+                result.update({"status": "invalid", "errors": item_errors})
+            elif "errors" not in result:
+                result["status"] = "skipped"
+        return Response({"message": message, "results": results}, status=status.HTTP_400_BAD_REQUEST)
+
+    def has_failed(self, results) -> bool:
+        return any(result["status"] != "skipped" for result in results)
+
+    @extend_schema(
+        tags=["Tasks"],
+        description=(
+            "Create several tasks for the authenticated user in one transaction. "
+            "Either every item is created or none is; the response reports a result per item."
+        ),
+        request=TaskSerializer(many=True),
+        responses={201: None, 400: None},
+    )
+    def post(self, request, *args, **kwargs):
+        errors = self.get_operations_errors(request.data)
+        if errors:
+            return self.failed_response("Bulk task creation failed.", errors)
+
+        serializer = TaskSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return self.failed_response("Bulk task creation failed.", serializer.errors)
+        owner_name = self.get_owner_name(request)
+        for task in serializer.save(user_id=request.user.id):
+            task.user_name = owner_name
+        return Response(
+            {
+                "message": "Tasks created successfully.",
+                "results": [{"id": task["id"], "status": "created", "task": task} for task in serializer.data],
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        tags=["Tasks"],
+        description=(
+            "Fully update several tasks in one transaction. Each item must include its `id`. "
+            "Accessible by owner or admin."
+        ),
+        request=TaskSerializer(many=True),
+        responses={200: None, 400: None},
+    )
+    def put(self, request, *args, **kwargs):
+        errors = self.get_operations_errors(request.data)
+        if errors:
+            return self.failed_response("Bulk task update failed.", errors)
+
+        raw_ids = [item.get("id") if isinstance(item, dict) else None for item in request.data]
+        results, tasks = self.resolve_tasks(request, raw_ids)
+        if self.has_failed(results):
+            return self.failed_response("Bulk task update failed.", [{} for _ in results], results)
+
+        items = [{**item, "id": result["id"]} for item, result in zip(request.data, results)]
+        instances = [tasks[result["id"]] for result in results]
+        serializer = TaskSerializer(instances, data=items, many=True)
+        if not serializer.is_valid():
+            return self.failed_response("Bulk task update failed.", serializer.errors, results)
+        serializer.save()
+        return Response(
+            {
+                "message": "Tasks updated successfully.",
+                "results": [{"id": task["id"], "status": "updated", "task": task} for task in serializer.data],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @extend_schema(
+        tags=["Tasks"],
+        description="Delete several tasks by id in one transaction. Accessible by owner or admin.",
+        request={"application/json": {"type": "array", "items": {"type": "integer"}}},
+        responses={200: None, 400: None},
+    )
+    def delete(self, request, *args, **kwargs):
+        errors = self.get_operations_errors(request.data)
+        if errors:
+            return self.failed_response("Bulk task deletion failed.", errors)
+
+        results, tasks = self.resolve_tasks(request, request.data)
+        if self.has_failed(results):
+            return self.failed_response("Bulk task deletion failed.", [{} for _ in results], results)
+
+        delete_tasks(list(tasks.values()))
+        for result in results:
+            result["status"] = "deleted"
+        return Response(
+            {"message": "Tasks deleted successfully.", "results": results},
+            status=status.HTTP_200_OK,
+        )
+
+
+class UserScopedAPIView(APIView):
+
+    permission_classes = [IsAuthenticated]
+    invalid_request_message = "Invalid request."
+
+    def get_user_scope(self, request) -> int | None:
+        # Admins may narrow to one owner with ?user_id= (None means every user); everyone else sees their own.
+        if not request.user.has_global_data_access():
+            return request.user.id
+        user_id = request.query_params.get("user_id")
+        if not user_id:
+            return None
+        if not user_id.isdigit():
+            raise ValidationError(
+                {"message": self.invalid_request_message, "errors": {"user_id": ["A valid integer is required."]}}
+            )
+        return int(user_id)
+
+
+class TaskStatsAPIView(UserScopedAPIView):
+
+    invalid_request_message = "Invalid stats request."
+
+    @extend_schema(
+        tags=["Tasks"],
+        description=(
+            "Task counts by status and priority, overdue count and total estimated time for the "
+            "authenticated user (or across all users for admin users)."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="user_id",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description="Return the stats of one user (admin/super admin only).",
+            ),
+        ],
+        examples=[
+            OpenApiExample(
+                "Task stats",
+                value={
+                    "total": 3,
+                    "completed": 1,
+                    "overdue": 1,
+                    "estimated_time": 90,
+                    "by_status": {"PENDING": 2, "IN_PROGRESS": 0, "COMPLETED": 1, "CANCELLED": 0},
+                    "by_priority": {"LOW": 0, "MEDIUM": 2, "HIGH": 1},
+                },
+                response_only=True,
+            )
+        ],
+        responses={200: None},
+    )
+    def get(self, request, *args, **kwargs):
+        user_id = self.get_user_scope(request)
+        return Response(get_task_stats(user_id), status=status.HTTP_200_OK)
+
+
+class TaskChangesAPIView(UserScopedAPIView):
+
+    invalid_request_message = "Invalid change request."
+
+    @extend_schema(
+        tags=["Tasks"],
+        description=(
+            "Tasks created or updated, and ids of tasks deleted, since a change token. Call without "
+            "`since` for a full sync, then keep passing the returned `next` token. Keep calling while "
+            "`has_more` is true."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="since",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="The `next` token returned by the previous call.",
+            ),
+            OpenApiParameter(
+                name="user_id",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description="Only sync tasks of this owner (admin/super admin only).",
+            ),
+            *sparse_fieldset_parameters,
+        ],
+        examples=[
+            OpenApiExample(
+                "Task changes",
+                value={
+                    "changes": [{"id": 7, "title": "Finish report", "completed": True}],
+                    "deleted": [3],
+                    "next": "<opaque change token>",
+                    "has_more": False,
+                },
+                response_only=True,
+            )
+        ],
+        responses={200: None, 400: None, 410: None},
+    )
+    def get(self, request, *args, **kwargs):
+        fields = TaskReadSerializer.get_requested_fields(request.query_params)
+        user_id = self.get_user_scope(request)
+        tasks, tombstones = Task.objects.all(), DeletedTask.objects.all()
+        if user_id is not None:
+            tasks, tombstones = tasks.filter(user_id=user_id), tombstones.filter(user_id=user_id)
+
+        since = request.query_params.get("since")
+        if since:
+            try:
+                token = ChangeToken.decode(since)
+            except ValueError:
+                return Response(
+                    {"message": "Invalid change token.", "errors": {"since": ["Invalid change token."]}},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if token.is_expired():
+                return Response(
+                    {"message": "Change token expired. Run a full sync without `since`."},
+                    status=status.HTTP_410_GONE,
+                )
+        else:
+            token = ChangeToken.initial(tombstones)
+
+        rows, deleted, next_token, has_more = get_changes(
+            TaskReadSerializer.get_values(tasks, fields),
+            tombstones,
+            token,
+            getattr(settings, "TASK_CHANGES_PAGE_SIZE", 100),
+        )
+        return Response(
+            {
+                "changes": TaskReadSerializer(rows, many=True, fields=fields).data,
+                "deleted": deleted,
+                "next": next_token.encode(),
+                "has_more": has_more,
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import get_token_version
+from .models import UserType
+
+
+class UserTypeJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from exc
+
+        try:
+            user = self.user_model.objects.select_related("user_type").get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as exc:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from exc
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+        return user
+
+
+class ClaimsUser(TokenUser):
+
+    def __str__(self) -> str:
+        return self.email
+
+    @cached_property
+    def id(self) -> int:
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self) -> int:
+        return self.id
+
+    @cached_property
+    def email(self) -> str:
+        return self.token.get("email", "")
+
+    @cached_property
+    def username(self) -> str:
+        return self.email
+
+    @cached_property
+    def name(self) -> str:
+        return self.token.get("name", "")
+
+    @cached_property
+    def user_type_code(self) -> str | None:
+        return self.token.get("user_type")
+
+    def get_full_name(self) -> str:
+        return self.name
+
+    def has_global_data_access(self) -> bool:
+        if self.is_superuser or self.is_staff:
+            return True
+        return self.user_type_code in {UserType.ADMIN, UserType.SUPER_ADMIN}
+
+    @cached_property
+    def instance(self):
+        return get_user_model().objects.select_related("user_type").get(pk=self.id)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        token_version = validated_token.get("token_version")
+        if token_version is None or token_version != get_token_version(user.id):
+            raise AuthenticationFailed(_("Token has been revoked."), code="token_revoked")
+        return user
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashing import get_dummy_password, hash_password, password_needs_rehash, verify_password
+
+
+UserModel = get_user_model()
+
+
+class PooledHashingModelBackend(ModelBackend):
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Spend the same hashing time as for a real account, so response times do not reveal emails.
+            verify_password(password, get_dummy_password())
+            return None
+        if self.check_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def check_password(self, user, password: str) -> bool:
+        if not user.has_usable_password() or not verify_password(password, user.password):
+            return False
+        if password_needs_rehash(user.password):
+            user.password = hash_password(password)
+            user.save(update_fields=["password"])
+        return True
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from config.cache import get_shared_cache
+
+
+BLOOM_KEY = "users:token-blacklist:bloom"
+BLOOM_LOCK_KEY = "users:token-blacklist:bloom-lock"
+REVOKED_KEY = "users:token-blacklist:revoked"
+
+
+def _jti_key(jti: str) -> str:
+    return f"users:token-blacklist:jti:{jti}"
+
+
+class BloomFilter:
+
+    def __init__(self, size: int, hash_count: int, bits: bytearray | None = None):
+        self.size = size
+        self.hash_count = hash_count
+        self.bits = bits if bits is not None else bytearray((size + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> BloomFilter:
+        size = math.ceil(-max(capacity, 1) * math.log(error_rate) / math.log(2) ** 2)
+        return cls(max(1024, size), max(1, math.ceil(-math.log2(error_rate))))
+
+    def positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        # The step must not be a multiple of the size, or every probe lands on the same bit.
+        first = int.from_bytes(digest[:8], "big")
+        second = 1 + int.from_bytes(digest[8:], "big") % (self.size - 1)
+        return ((first + index * second) % self.size for index in range(self.hash_count))
+
+    def add(self, value: str) -> None:
+        for position in self.positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(value))
+
+
+def get_blacklist_cache():
+    # Every worker has to see every revocation.
+    return get_shared_cache("JWT_BLACKLIST_CACHE")
+
+
+def rebuild_blacklist_bloom(blacklist_cache) -> BloomFilter | None:
+    # A counter epoch that restarts after eviction cannot match a filter stored for the previous one.
+    blacklist_cache.add(REVOKED_KEY, time.time_ns(), timeout=None)
+    revoked = blacklist_cache.get(REVOKED_KEY)
+    if revoked is None:
+        return None
+    # The counter is read first: any revocation missing from the query below was counted after it,
+    # so the stored filter stops matching the counter and is not trusted.
+    jtis = list(
+        BlacklistedToken.objects.filter(token__expires_at__gt=aware_utcnow()).values_list("token__jti", flat=True)
+    )
+    bloom = BloomFilter.for_capacity(len(jtis) * 2, settings.JWT_BLACKLIST_BLOOM_ERROR_RATE)
+    for jti in jtis:
+        bloom.add(jti)
+    store_blacklist_bloom(blacklist_cache, time.time(), revoked, bloom)
+    return bloom
+
+
+def store_blacklist_bloom(blacklist_cache, built_at: float, revoked: int, bloom: BloomFilter) -> None:
+    blacklist_cache.set(BLOOM_KEY, (built_at, revoked, bloom.size, bloom.hash_count, bytes(bloom.bits)), timeout=None)
+
+
+def get_blacklist_bloom(blacklist_cache, cached, revoked) -> BloomFilter | None:
+    # Trusted only while it covers every revocation counted so far; rebuilt after JWT_BLACKLIST_CACHE_TTL
+    # to drop expired tokens and keep the false positive rate down.
+    if cached is not None:
+        built_at, covered, size, hash_count, bits = cached
+        if covered == revoked and time.time() - built_at < settings.JWT_BLACKLIST_CACHE_TTL:
+            return BloomFilter(size, hash_count, bytearray(bits))
+    if blacklist_cache.add(BLOOM_LOCK_KEY, True, timeout=30):
+        try:
+            return rebuild_blacklist_bloom(blacklist_cache)
+        finally:
+            blacklist_cache.delete(BLOOM_LOCK_KEY)
+    return None
+
+
+def remember_blacklisted(jti: str) -> None:
+    blacklist_cache = get_blacklist_cache()
+    blacklist_cache.set(_jti_key(jti), True, timeout=settings.JWT_BLACKLIST_CACHE_TTL)
+    try:
+        revoked = blacklist_cache.incr(REVOKED_KEY)
+    except ValueError:
+        # Counter evicted: the stored filter no longer matches any counter, so it gets rebuilt.
+        return
+    cached = blacklist_cache.get(BLOOM_KEY)
+    # Only a filter covering every earlier revocation is extended. When two revocations race, one of them
+    # skips this, the filter falls behind the counter and the next check rebuilds it from the database.
+    if cached is not None and cached[1] == revoked - 1:
+        built_at, _, size, hash_count, bits = cached
+        bloom = BloomFilter(size, hash_count, bytearray(bits))
+        bloom.add(jti)
+        store_blacklist_bloom(blacklist_cache, built_at, revoked, bloom)
+
+
+def is_blacklisted(jti: str) -> bool:
+    blacklist_cache = get_blacklist_cache()
+    key = _jti_key(jti)
+    cached = blacklist_cache.get_many([BLOOM_KEY, REVOKED_KEY, key])
+    if cached.get(key):
+        return True
+    bloom = get_blacklist_bloom(blacklist_cache, cached.get(BLOOM_KEY), cached.get(REVOKED_KEY))
+    if bloom is not None and jti not in bloom:
+        return False
+    # Possible bloom false positive, or no usable filter: ask the database.
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+def prune_expired_tokens(batch_size: int = 1000) -> int:
+    now = aware_utcnow()
+    pruned = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now)
+            .order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return pruned
+        with transaction.atomic():
+            OutstandingToken.objects.filter(id__in=ids).delete()
+        pruned += len(ids)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from config.cache import get_shared_cache
+
+
+def _token_version_key(user_id) -> str:
+    return f"users:token-version:{user_id}"
+
+
+def get_token_version(user_id) -> int | None:
+    # A per-process copy would keep accepting revoked tokens (and stale role claims) on every other worker.
+    cache = get_shared_cache("JWT_STATELESS_AUTH")
+    key = _token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            get_user_model()
+            .objects.filter(pk=user_id, is_active=True)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        if version is not None:
+            cache.set(key, version, timeout=None)
+    return version
+
+
+def set_token_version(user_id, version: int) -> None:
+    cache.set(_token_version_key(user_id), version, timeout=None)
+
+
+def clear_token_version(user_id) -> None:
+    cache.delete(_token_version_key(user_id))
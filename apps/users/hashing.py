@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from django.core.exceptions import ValidationError
+
+
+class PasswordHashingBusy(ValidationError):
+    # Not a DRF exception: the admin login form shows it as an error, and the API serializers turn it into a 503.
+    def __init__(self) -> None:
+        super().__init__("Too many logins in progress. Try again shortly.", code="password_hashing_busy")
+
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_pending: threading.BoundedSemaphore | None = None
+
+
+def _setup_worker(settings_module: str) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def create_hashing_executor(workers: int) -> ProcessPoolExecutor:
+    # Spawned rather than forked: forking a threaded server process is unsafe.
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_setup_worker,
+        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "config.settings"),),
+    )
+
+
+def get_hashing_executor() -> ProcessPoolExecutor | None:
+    global _executor, _pending
+    if settings.PASSWORD_HASHING_WORKERS <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = create_hashing_executor(settings.PASSWORD_HASHING_WORKERS)
+            _pending = threading.BoundedSemaphore(settings.PASSWORD_HASHING_MAX_PENDING)
+        return _executor
+
+
+def shutdown_hashing_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def run_hasher(function, *args):
+    executor = get_hashing_executor()
+    if executor is None:
+        return function(*args)
+    pending = _pending
+    # Reject instead of queueing without bound when every worker is busy.
+    if not pending.acquire(blocking=False):
+        raise PasswordHashingBusy()
+    future = None
+    try:
+        future = executor.submit(function, *args)
+        return future.result(timeout=settings.PASSWORD_HASHING_TIMEOUT)
+    except FutureTimeoutError as exc:
+        # Drop the check if it is still queued; one already running in a worker cannot be interrupted.
+        future.cancel()
+        raise PasswordHashingBusy() from exc
+    except BrokenProcessPool:
+        shutdown_hashing_executor()
+        return function(*args)
+    finally:
+        pending.release()
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    return run_hasher(check_password, password, encoded)
+
+
+def hash_password(password: str) -> str:
+    return run_hasher(make_password, password)
+
+
+def password_needs_rehash(encoded: str) -> bool:
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    preferred = get_hasher("default")
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+@lru_cache(maxsize=None)
+def get_dummy_password() -> str:
+    return hash_password("dummy password for unknown accounts")
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import importlib.util
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import check_password, get_hasher, make_password
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from apps.users.hashing import get_hashing_executor, verify_password
+
+
+HASHERS = {
+    "pbkdf2": "apps.users.hashers.TunedPBKDF2PasswordHasher",
+    "scrypt": "apps.users.hashers.TunedScryptPasswordHasher",
+    "argon2": "apps.users.hashers.TunedArgon2PasswordHasher",
+}
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Time one password check per configured hasher, then a burst of concurrent logins verified "
+        "in the request threads versus the hashing process pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=32, help="Concurrent logins in the burst.")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        password = "benchmark-password"
+        for name, path in HASHERS.items():
+            if name == "argon2" and importlib.util.find_spec("argon2") is None:
+                self.stdout.write(f"{name:>7}: skipped (argon2-cffi is not installed)")
+                continue
+            with override_settings(PASSWORD_HASHERS=[path]):
+                encoded = make_password(password)
+                timings = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    check_password(password, encoded)
+                    timings.append((time.perf_counter() - started) * 1000)
+                summary = get_hasher().safe_summary(encoded)
+                parameters = ", ".join(f"{key}={value}" for key, value in summary.items() if key not in {"salt", "hash"})
+                self.stdout.write(f"{name:>7}: verify median={statistics.median(timings):8.1f} ms  ({parameters})")
+
+        encoded = make_password(password)
+        get_hashing_executor()
+        verify_password(password, encoded)  # Start the pool workers before timing.
+        logins = options["logins"]
+        for label, verify in (("inline", check_password), ("pool", verify_password)):
+            started = time.perf_counter()
+            probe = []
+            with ThreadPoolExecutor(max_workers=logins + 1) as threads:
+                futures = [threads.submit(verify, password, encoded) for _ in range(logins)]
+                while not all(future.done() for future in futures):
+                    tick = time.perf_counter()
+                    sum(range(10000))
+                    probe.append((time.perf_counter() - tick) * 1000)
+                    time.sleep(0.01)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{label:>7}: logins={logins} logins/s={logins / elapsed:7.1f} "
+                f"other work p50={statistics.median(probe or [0]):6.2f} ms max={max(probe or [0]):6.2f} ms"
+            )
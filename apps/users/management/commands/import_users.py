@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import csv
+import os
+import sys
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import Lower
+
+from apps.users.hashing import create_hashing_executor
+from apps.users.models import UserType
+
+
+User = get_user_model()
+IMPORT_FIELDS = (
+    "first_name",
+    "last_name",
+    "phone_number",
+    "bio",
+    "address",
+    "city",
+    "country",
+)
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Create users from a CSV file with an email column and optional password, first_name, last_name, "
+        "phone_number, bio, address, city, country and user_type columns. Existing emails are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import, or - for standard input.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes used to hash passwords (1 hashes in this process).",
+        )
+        parser.add_argument("--user-type", default=UserType.USER, help="Role code for rows without user_type.")
+
+    def handle(self, *args, **options):
+        user_types = {user_type.code: user_type for user_type in UserType.objects.all()}
+        if options["user_type"] not in user_types:
+            raise CommandError(f"Unknown user type '{options['user_type']}'.")
+
+        source = sys.stdin if options["path"] == "-" else open(options["path"], newline="", encoding="utf-8")
+        executor = create_hashing_executor(options["workers"]) if options["workers"] > 1 else None
+        created = skipped = 0
+        try:
+            reader = csv.DictReader(source)
+            while batch := list(islice(reader, options["batch_size"])):
+                batch_created, batch_skipped = self.import_batch(batch, user_types, executor, options)
+                created, skipped = created + batch_created, skipped + batch_skipped
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if source is not sys.stdin:
+                source.close()
+        self.stdout.write(self.style.SUCCESS(f"Imported {created} users, skipped {skipped}."))
+
+    def import_batch(self, rows, user_types, executor, options):
+        rows_by_email = {}
+        for row in rows:
+            email = (row.get("email") or "").strip().lower()
+            if email:
+                rows_by_email.setdefault(email, row)
+        existing = set(
+            User.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=rows_by_email)
+            .values_list("email_lower", flat=True)
+        )
+        rows_by_email = {email: row for email, row in rows_by_email.items() if email not in existing}
+
+        users = []
+        for email, row in rows_by_email.items():
+            code = row.get("user_type") or options["user_type"]
+            if code not in user_types:
+                raise CommandError(f"Unknown user type '{code}' for {email}.")
+            user = User(
+                email=email,
+                user_type=user_types[code],
+                **{field: (row.get(field) or "").strip() for field in IMPORT_FIELDS},
+            )
+            # bulk_create skips save(), which derives the staff flags from the role.
+            user.apply_user_type_flags()
+            users.append(user)
+
+        # Rows without a password get an unusable one (make_password(None)).
+        passwords = [row.get("password") or None for row in rows_by_email.values()]
+        if executor is None:
+            hashed = map(make_password, passwords)
+        else:
+            chunksize = max(1, len(passwords) // (options["workers"] * 4))
+            hashed = executor.map(make_password, passwords, chunksize=chunksize)
+        for user, password in zip(users, hashed):
+            user.password = password
+
+        # Emails registered since the lookup above are left alone rather than failing the batch.
+        User.objects.bulk_create(users, ignore_conflicts=True)
+        # Ignored rows are dropped silently and get no pk, so count the rows that were written. Salted
+        # hashes (and unusable passwords) are unique, which tells ours apart from a racing registration.
+        created = User.objects.filter(
+            email__in=[user.email for user in users], password__in=[user.password for user in users]
+        ).count()
+        return created, len(rows) - created
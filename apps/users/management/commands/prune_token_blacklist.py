@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.users.blacklist import get_blacklist_cache, prune_expired_tokens, rebuild_blacklist_bloom
+
+
+class Command(BaseCommand):
+
+    help = "Delete expired outstanding and blacklisted refresh tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.JWT_BLACKLIST_PRUNE_BATCH_SIZE)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep running and prune again every N seconds (0 runs once).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            pruned = prune_expired_tokens(batch_size=options["batch_size"])
+            if settings.JWT_BLACKLIST_CACHE:
+                rebuild_blacklist_bloom(get_blacklist_cache())
+            self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} expired tokens."))
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+        ('users', '0005_user_token_version'),
+    ]
+
+    # The token_blacklist app ships without an index on expires_at, which the pruning job filters and sorts on.
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS token_blacklist_outstandingtoken_expires_idx "
+                "ON token_blacklist_outstandingtoken (expires_at)"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS token_blacklist_outstandingtoken_expires_idx",
+        ),
+    ]
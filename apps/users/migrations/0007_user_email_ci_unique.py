@@ -0,0 +1,45 @@
+# Generated by Django 5.0.14 on 2026-10-17 01:55
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def resolve_email_collisions(apps, schema_editor):
+    # Emails that only differ by case would violate the new index. Login used to match the lowercased
+    # email exactly, so an all-lowercase account (else the oldest one) keeps the address and the others
+    # are renamed to local+duplicate-<id>@domain for an admin to merge.
+    User = apps.get_model("users", "User")
+    collisions = (
+        User.objects.annotate(email_lower=Lower("email"))
+        .values("email_lower")
+        .annotate(accounts=Count("id"))
+        .filter(accounts__gt=1)
+        .values_list("email_lower", flat=True)
+    )
+    for email_lower in collisions:
+        users = sorted(
+            User.objects.annotate(email_lower=Lower("email")).filter(email_lower=email_lower),
+            key=lambda user: (user.email != email_lower, user.pk),
+        )
+        for user in users[1:]:
+            local, _, domain = user.email.rpartition("@")
+            user.email = f"{local}+duplicate-{user.pk}@{domain}"
+            user.save(update_fields=["email"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0006_outstandingtoken_expires_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(resolve_email_collisions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='users_user_email_ci_unique', violation_error_message='A user with this email already exists.'),
+        ),
+    ]
@@ -1,6 +1,13 @@
+from functools import lru_cache
+
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
+
+from .cache import set_token_version
 
 
 class UserType(models.Model):
@@ -28,10 +35,23 @@ class UserType(models.Model):
         return self.name
 
 
+@lru_cache(maxsize=None)
+def get_default_user_type() -> UserType | None:
+    # Roles are seeded by migration and rarely change; signals clear this on any UserType write.
+    return UserType.objects.filter(code=UserType.USER).first()
+
+
 class UserManager(BaseUserManager):
 
     use_in_migrations = True
 
+    def filter_by_email(self, email: str):
+        # Matches the expression of the users_user_email_ci_unique index, so lookups stay index seeks.
+        return self.filter(Exact(Lower("email"), Lower(Value(email))))
+
+    def get_by_natural_key(self, email):
+        return self.filter_by_email(email).get()
+
     def _create_user(self, email, password, **extra_fields):
         if not email:
             raise ValueError("The Email field must be set.")
@@ -73,11 +93,32 @@ class User(AbstractUser):
     address = models.CharField(max_length=255, blank=True)
     city = models.CharField(max_length=100, blank=True)
     country = models.CharField(max_length=100, blank=True)
+    token_version = models.PositiveIntegerField(default=0)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
     objects = UserManager()
 
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                Lower("email"),
+                name="users_user_email_ci_unique",
+                violation_error_message="A user with this email already exists.",
+            ),
+        ]
+
+    TOKEN_STATE_FIELDS = ("user_type_id", "is_staff", "is_superuser", "is_active")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded_values = dict(zip(field_names, values))
+        instance._loaded_token_state = {
+            field: loaded_values[field] for field in cls.TOKEN_STATE_FIELDS if field in loaded_values
+        }
+        return instance
+
     def has_global_data_access(self) -> bool:
         if self.is_superuser:
             return True
@@ -102,9 +143,29 @@ class User(AbstractUser):
             self.is_staff = False
             self.is_superuser = False
 
+    def token_state_changed(self) -> bool:
+        loaded_state = getattr(self, "_loaded_token_state", None)
+        if not loaded_state:
+            return False
+        return any(getattr(self, field) != value for field, value in loaded_state.items())
+
+    def revoke_tokens(self) -> None:
+        User.objects.filter(pk=self.pk).update(token_version=models.F("token_version") + 1)
+        self.refresh_from_db(fields=["token_version"])
+        set_token_version(self.pk, self.token_version)
+
     def save(self, *args, **kwargs):
         self.apply_user_type_flags()
+        revoke = self.token_state_changed()
+        if revoke:
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
         super().save(*args, **kwargs)
+        self._loaded_token_state = {field: getattr(self, field) for field in self.TOKEN_STATE_FIELDS}
+        if revoke:
+            set_token_version(self.pk, self.token_version)
 
     def __str__(self) -> str:
         return self.email
@@ -0,0 +1,8 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+
+    page_size = settings.REST_FRAMEWORK.get("PAGE_SIZE", 10)
+    ordering = "id"
@@ -3,16 +3,29 @@ from __future__ import annotations
 import re
 
 from django.contrib.auth import authenticate, get_user_model
-from rest_framework import serializers
-from rest_framework.exceptions import AuthenticationFailed
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.db import IntegrityError, transaction
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException, AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 
-from .models import UserType
+from config.metrics import TimedSerializerMixin
+
+from .hashing import PasswordHashingBusy, hash_password
+from .models import UserType, get_default_user_type
+from .throttles import LoginAttemptThrottle
+from .tokens import UserClaimsRefreshToken
 
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class PasswordHashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many logins in progress. Try again shortly."
+    default_code = "password_hashing_unavailable"
+
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user_type = serializers.SlugRelatedField(read_only=True, slug_field="code")
 
     class Meta:
@@ -46,6 +59,8 @@ class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
     password_confirm = serializers.CharField(write_only=True, min_length=8)
 
+    DUPLICATE_EMAIL_MESSAGE = "A user with this email already exists."
+
     class Meta:
         model = User
         fields = (
@@ -62,12 +77,11 @@ class RegisterSerializer(serializers.ModelSerializer):
             "password",
             "password_confirm",
         )
+        # Duplicates are caught by the unique constraint in create() instead of a lookup query.
+        extra_kwargs = {"email": {"validators": []}}
 
     def validate_email(self, value: str) -> str:
-        normalized_email = value.strip().lower()
-        if User.objects.filter(email=normalized_email).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return normalized_email
+        return value.strip().lower()
 
     def validate(self, attrs: dict) -> dict:
         if attrs["password"] != attrs["password_confirm"]:
@@ -91,12 +105,22 @@ class RegisterSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data: dict) -> User:
         validated_data.pop("password_confirm")
-        user_type = validated_data.pop("user_type", None)
-        if user_type is None:
-            user_type = UserType.objects.filter(code=UserType.USER).first()
-        if user_type:
-            validated_data["user_type"] = user_type
-        return User.objects.create_user(**validated_data)
+        password = validated_data.pop("password")
+        if validated_data.get("user_type") is None:
+            validated_data["user_type"] = get_default_user_type()
+        user = User(**validated_data)
+        try:
+            user.password = hash_password(password)
+        except PasswordHashingBusy as exc:
+            raise PasswordHashingUnavailable() from exc
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+        except IntegrityError:
+            if User.objects.filter_by_email(user.email).exists():
+                raise serializers.ValidationError({"email": [self.DUPLICATE_EMAIL_MESSAGE]})
+            raise
+        return user
 
 
 class LoginSerializer(serializers.Serializer):
@@ -107,14 +131,58 @@ class LoginSerializer(serializers.Serializer):
         email = attrs.get("email", "").strip().lower()
         password = attrs.get("password")
         request = self.context.get("request")
-        user = authenticate(request=request, email=email, password=password)
+        throttle = LoginAttemptThrottle(request, email)
+        throttle.check()
+        try:
+            user = authenticate(request=request, email=email, password=password)
+        except PasswordHashingBusy as exc:
+            raise PasswordHashingUnavailable() from exc
         if not user:
+            throttle.record_failure()
             raise AuthenticationFailed("Invalid email or password.")
         if not user.is_active:
             raise AuthenticationFailed("This account is disabled.")
+        throttle.reset()
         attrs["user"] = user
         return attrs
 
 
 class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
     username_field = User.EMAIL_FIELD
+    token_class = UserClaimsRefreshToken
+
+    def validate(self, attrs: dict) -> dict:
+        throttle = LoginAttemptThrottle(self.context.get("request"), attrs.get(self.username_field))
+        throttle.check()
+        try:
+            data = super().validate(attrs)
+        except AuthenticationFailed:
+            throttle.record_failure()
+            raise
+        except PasswordHashingBusy as exc:
+            raise PasswordHashingUnavailable() from exc
+        throttle.reset()
+        return data
+
+
+class UserClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = UserClaimsRefreshToken
+
+    def validate(self, attrs: dict) -> dict:
+        refresh = self.token_class(attrs["refresh"])
+        user = refresh.get_user()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # Blacklisting the old token and recording the new one share a single commit.
+            with transaction.atomic():
+                if api_settings.BLACKLIST_AFTER_ROTATION:
+                    refresh.blacklist()
+                refresh.set_jti()
+                refresh.set_exp()
+                refresh.set_iat()
+                refresh.outstand()
+            data["refresh"] = str(refresh)
+        return data
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import UserType, get_default_user_type
+
+
+@receiver(post_save, sender=UserType)
+@receiver(post_delete, sender=UserType)
+def clear_default_user_type(**kwargs) -> None:
+    get_default_user_type.cache_clear()
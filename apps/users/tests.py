@@ -1,17 +1,55 @@
 from __future__ import annotations
 
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from apps.tasks.models import Task
+from apps.tasks.views import TaskDetailAPIView
 
-from .models import UserType
+from .authentication import ClaimsUser, StatelessJWTAuthentication
+from .blacklist import BLOOM_KEY, REVOKED_KEY, BloomFilter, is_blacklisted, prune_expired_tokens
+from .hashing import PasswordHashingBusy, run_hasher, verify_password
+from .models import UserType, get_default_user_type
+from .serializers import UserSerializer
+from .tokens import UserClaimsRefreshToken
 
 User = get_user_model()
 
 
+def use_shared_cache(test_case) -> None:
+    # Local memory is private to one process, so features every worker must agree on refuse it.
+    location = test_case.enterContext(tempfile.TemporaryDirectory())
+    test_case.enterContext(
+        override_settings(
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location}}
+        )
+    )
+
+
 class AuthAPITests(APITestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.register_url = reverse("v1:register")
         self.login_url = reverse("v1:login")
         self.token_url = reverse("v1:token_obtain_pair")
@@ -37,6 +75,68 @@ class AuthAPITests(APITestCase):
         self.assertIsNotNone(user.user_type)
         self.assertEqual(user.user_type.code, UserType.USER)
 
+    def test_register_duplicate_email_returns_400(self) -> None:
+        User.objects.create_user(email="alice@example.com", password=self.valid_password)
+        payload = {**self.user_payload, "email": " Alice@Example.com "}
+
+        response = self.client.post(self.register_url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["email"], ["A user with this email already exists."])
+        self.assertEqual(User.objects.filter(email="alice@example.com").count(), 1)
+
+    @override_settings(PASSWORD_HASHING_WORKERS=0, PBKDF2_ITERATIONS=1000)
+    def test_register_is_a_single_insert(self) -> None:
+        get_default_user_type()
+        with self.assertNumQueries(3):
+            response = self.client.post(self.register_url, self.user_payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["user"]["user_type"], UserType.USER)
+
+    def test_default_user_type_cache_is_cleared_on_change(self) -> None:
+        user_type = get_default_user_type()
+        user_type.name = "Member"
+        user_type.save()
+        self.assertEqual(get_default_user_type().name, "Member")
+
+    @override_settings(PBKDF2_ITERATIONS=1000)
+    def test_import_users_command(self) -> None:
+        User.objects.create_user(email="existing@example.com", password=self.valid_password)
+        path = os.path.join(self.enterClassContext(tempfile.TemporaryDirectory()), "users.csv")
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            handle.write(
+                "email,password,first_name,user_type\n"
+                "New@Example.com,StrongPass123!,New,\n"
+                "staff@example.com,,Staff,staff\n"
+                "existing@example.com,StrongPass123!,Old,\n"
+                "new@example.com,StrongPass123!,Again,\n"
+            )
+
+        stdout = StringIO()
+        call_command("import_users", path, batch_size=2, workers=1, stdout=stdout)
+        self.assertIn("Imported 2 users, skipped 2.", stdout.getvalue())
+        new_user = User.objects.get(email="new@example.com")
+        self.assertTrue(new_user.check_password(self.valid_password))
+        self.assertEqual(new_user.user_type.code, UserType.USER)
+        staff_user = User.objects.get(email="staff@example.com")
+        self.assertTrue(staff_user.is_staff)
+        self.assertFalse(staff_user.has_usable_password())
+
+    def test_import_users_counts_rows_lost_to_concurrent_registrations(self) -> None:
+        path = os.path.join(self.enterClassContext(tempfile.TemporaryDirectory()), "users.csv")
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            handle.write("email,password\nrace@example.com,StrongPass123!\nfresh@example.com,StrongPass123!\n")
+        register = User.objects.bulk_create
+
+        def register_first(users, **kwargs):
+            # Registered after the existing-email lookup, right before the import inserts.
+            User.objects.create_user(email="race@example.com", password=self.valid_password)
+            return register(users, **kwargs)
+
+        stdout = StringIO()
+        with mock.patch.object(User.objects, "bulk_create", side_effect=register_first):
+            call_command("import_users", path, workers=1, stdout=stdout)
+        self.assertIn("Imported 1 users, skipped 1.", stdout.getvalue())
+
     def test_register_requires_first_and_last_name(self) -> None:
         payload = {
             "email": "missing-name@example.com",
@@ -121,7 +221,8 @@ class AuthAPITests(APITestCase):
         self.client.force_authenticate(user=current_user)
         response = self.client.get(self.user_data_url, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
         self.assertEqual(response.data["results"][0]["email"], "user-one@example.com")
 
     def test_admin_and_super_admin_see_all_user_data(self) -> None:
@@ -159,11 +260,32 @@ class AuthAPITests(APITestCase):
         self.client.force_authenticate(user=admin_user)
         admin_response = self.client.get(self.user_data_url, format="json")
         self.assertEqual(admin_response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(admin_response.data["count"], 4)
+        self.assertGreaterEqual(len(admin_response.data["results"]), 4)
         self.client.force_authenticate(user=super_admin_user)
         super_response = self.client.get(self.user_data_url, format="json")
         self.assertEqual(super_response.status_code, status.HTTP_200_OK)
-        self.assertEqual(super_response.data["count"], admin_response.data["count"])
+        self.assertEqual(super_response.data["results"], admin_response.data["results"])
+
+    def test_login_matches_email_case_insensitively(self) -> None:
+        User.objects.create_user(email="Mixed.Case@Example.com", password=self.valid_password)
+
+        for url in (self.login_url, self.token_url):
+            response = self.client.post(
+                url, {"email": "mixed.case@EXAMPLE.com", "password": self.valid_password}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(
+            self.register_url, {**self.user_payload, "email": "mixed.case@example.com"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["email"], ["A user with this email already exists."])
+
+    def test_email_lookup_uses_case_insensitive_index(self) -> None:
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plan assertions are written for SQLite.")
+        plan = User.objects.filter_by_email("Someone@Example.com").explain()
+        self.assertIn("users_user_email_ci_unique", plan)
 
     def test_login_with_invalid_credentials_returns_401(self) -> None:
         User.objects.create_user(
@@ -178,3 +300,352 @@ class AuthAPITests(APITestCase):
             format="json",
         )
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(LOGIN_MAX_FAILURES_PER_ACCOUNT=3)
+    def test_failed_logins_lock_the_account_before_hashing(self) -> None:
+        User.objects.create_user(email="locked@example.com", password=self.valid_password)
+        for _ in range(3):
+            response = self.client.post(
+                self.login_url, {"email": "locked@example.com", "password": "WrongPass123!"}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with mock.patch("apps.users.backends.verify_password") as verify:
+            response = self.client.post(
+                self.token_url, {"email": "locked@example.com", "password": self.valid_password}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+        verify.assert_not_called()
+
+    @override_settings(LOGIN_MAX_FAILURES_PER_IP=2)
+    def test_failed_logins_throttle_the_client_ip_across_accounts(self) -> None:
+        for email in ("first@example.com", "second@example.com"):
+            response = self.client.post(
+                self.token_url, {"email": email, "password": "WrongPass123!"}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Without a trusted proxy, a forged X-Forwarded-For does not reset the count.
+        response = self.client.post(
+            self.login_url,
+            {"email": "third@example.com", "password": "WrongPass123!"},
+            format="json",
+            HTTP_X_FORWARDED_FOR="198.51.100.9",
+        )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        response = self.client.post(
+            self.login_url,
+            {"email": "third@example.com", "password": "WrongPass123!"},
+            format="json",
+            REMOTE_ADDR="203.0.113.7",
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}):
+            response = self.client.post(
+                self.login_url,
+                {"email": "third@example.com", "password": "WrongPass123!"},
+                format="json",
+                HTTP_X_FORWARDED_FOR="198.51.100.9",
+            )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(PASSWORD_HASHING_WORKERS=0, PBKDF2_ITERATIONS=1000)
+    def test_login_rehashes_outdated_password_hashes(self) -> None:
+        user = User.objects.create_user(email="legacy@example.com")
+        user.password = make_password(self.valid_password, hasher="pbkdf2_sha1")
+        user.save(update_fields=["password"])
+
+        response = self.client.post(
+            self.login_url, {"email": "legacy@example.com", "password": self.valid_password}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$1000$"))
+
+        scrypt_first = [
+            "apps.users.hashers.TunedScryptPasswordHasher",
+            "apps.users.hashers.TunedPBKDF2PasswordHasher",
+        ]
+        with override_settings(PASSWORD_HASHERS=scrypt_first, SCRYPT_WORK_FACTOR=1024):
+            response = self.client.post(
+                self.token_url, {"email": "legacy@example.com", "password": self.valid_password}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            user.refresh_from_db()
+            self.assertTrue(user.password.startswith("scrypt$"))
+            self.assertTrue(user.check_password(self.valid_password))
+
+    def test_password_checks_run_in_the_hashing_pool(self) -> None:
+        self.assertGreater(settings.PASSWORD_HASHING_WORKERS, 0)
+        self.assertNotEqual(run_hasher(os.getpid), os.getpid())
+        encoded = make_password(self.valid_password)
+        self.assertTrue(verify_password(self.valid_password, encoded))
+        self.assertFalse(verify_password("WrongPass123!", encoded))
+
+    def test_timed_out_password_check_is_cancelled(self) -> None:
+        future = mock.Mock()
+        future.result.side_effect = FutureTimeoutError
+        executor = mock.Mock(submit=mock.Mock(return_value=future))
+        with (
+            mock.patch("apps.users.hashing.get_hashing_executor", return_value=executor),
+            mock.patch("apps.users.hashing._pending", threading.BoundedSemaphore(1)),
+        ):
+            with self.assertRaises(PasswordHashingBusy):
+                verify_password(self.valid_password, make_password(self.valid_password))
+        future.cancel.assert_called_once_with()
+
+    def test_busy_password_hashing_is_a_503_for_the_api_and_a_form_error_for_the_admin(self) -> None:
+        User.objects.create_user(email="busy@example.com", password=self.valid_password, is_staff=True)
+        credentials = {"email": "busy@example.com", "password": self.valid_password}
+        with mock.patch("apps.users.backends.verify_password", side_effect=PasswordHashingBusy):
+            for url in (self.login_url, self.token_url):
+                response = self.client.post(url, credentials, format="json")
+                self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+            response = self.client.post(
+                reverse("admin:login"), {"username": "busy@example.com", "password": self.valid_password}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, "Too many logins in progress.")
+
+    def test_admin_user_data_is_cursor_paginated(self) -> None:
+        admin_user = User.objects.create_user(
+            email="pager-admin@example.com",
+            password=self.valid_password,
+            user_type=UserType.objects.get(code=UserType.ADMIN),
+        )
+        User.objects.bulk_create(
+            User(email=f"bulk-{index}@example.com", password="!") for index in range(14)
+        )
+        self.client.force_authenticate(user=admin_user)
+
+        first_page = self.client.get(self.user_data_url, format="json")
+        second_page = self.client.get(first_page.data["next"], format="json")
+
+        self.assertEqual(len(first_page.data["results"]), 10)
+        self.assertEqual(len(second_page.data["results"]), 5)
+        self.assertIsNone(second_page.data["next"])
+        emails = [user["email"] for user in first_page.data["results"] + second_page.data["results"]]
+        self.assertEqual(len(set(emails)), 15)
+
+    def test_admin_can_stream_user_export(self) -> None:
+        admin_user = User.objects.create_user(
+            email="export-admin@example.com",
+            password=self.valid_password,
+            first_name="Export",
+            last_name="Admin",
+            user_type=UserType.objects.get(code=UserType.ADMIN),
+        )
+        User.objects.create_user(email="export-user@example.com", password=self.valid_password)
+        self.client.force_authenticate(user=admin_user)
+
+        ndjson_response = self.client.get(f"{self.user_data_url}?export=ndjson")
+        self.assertEqual(ndjson_response.status_code, status.HTTP_200_OK)
+        self.assertTrue(ndjson_response.streaming)
+        rows = [json.loads(line) for line in b"".join(ndjson_response.streaming_content).splitlines()]
+        self.assertEqual(
+            [row["email"] for row in rows],
+            ["export-admin@example.com", "export-user@example.com"],
+        )
+        self.assertEqual(rows[0], dict(UserSerializer(admin_user).data))
+
+        csv_response = self.client.get(f"{self.user_data_url}?export=csv")
+        lines = b"".join(csv_response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(","), list(UserSerializer.Meta.fields))
+        self.assertEqual(len(lines), 3)
+
+        invalid_response = self.client.get(f"{self.user_data_url}?export=xml")
+        self.assertEqual(invalid_response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StatelessJWTAuthenticationTests(APITestCase):
+    def setUp(self) -> None:
+        use_shared_cache(self)
+        self.user = User.objects.create_user(
+            email="claims@example.com",
+            password="StrongPass123!",
+            first_name="Clara",
+            last_name="Ims",
+            user_type=UserType.objects.get(code=UserType.USER),
+        )
+        self.factory = APIRequestFactory()
+
+    def get_request(self):
+        access_token = UserClaimsRefreshToken.for_user(self.user).access_token
+        return self.factory.get("/", HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+    def test_builds_claims_user_without_database_query(self) -> None:
+        request = self.get_request()
+        StatelessJWTAuthentication().authenticate(request)
+        with self.assertNumQueries(0):
+            claims_user, _ = StatelessJWTAuthentication().authenticate(request)
+
+        self.assertIsInstance(claims_user, ClaimsUser)
+        self.assertEqual(claims_user.id, self.user.id)
+        self.assertEqual(claims_user.email, "claims@example.com")
+        self.assertEqual(claims_user.get_full_name(), "Clara Ims")
+        self.assertFalse(claims_user.has_global_data_access())
+        self.assertEqual(claims_user.instance, self.user)
+
+    def test_role_change_revokes_issued_tokens(self) -> None:
+        request = self.get_request()
+        StatelessJWTAuthentication().authenticate(request)
+
+        self.user.user_type = UserType.objects.get(code=UserType.ADMIN)
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            StatelessJWTAuthentication().authenticate(request)
+        admin_user, _ = StatelessJWTAuthentication().authenticate(self.get_request())
+        self.assertTrue(admin_user.has_global_data_access())
+
+    def test_revoke_tokens_rejects_existing_tokens(self) -> None:
+        request = self.get_request()
+        StatelessJWTAuthentication().authenticate(request)
+
+        self.user.revoke_tokens()
+
+        with self.assertRaises(AuthenticationFailed):
+            StatelessJWTAuthentication().authenticate(request)
+
+    def test_stateless_auth_refuses_a_per_process_cache(self) -> None:
+        request = self.get_request()
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+            with self.assertRaises(ImproperlyConfigured):
+                StatelessJWTAuthentication().authenticate(request)
+
+    def test_task_detail_skips_user_row_fetch(self) -> None:
+        task = Task.objects.create(user=self.user, title="Stateless task")
+        access_token = UserClaimsRefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        detail_url = reverse("v1:task-detail", kwargs={"task_id": task.id})
+
+        with mock.patch.object(
+            TaskDetailAPIView, "authentication_classes", [StatelessJWTAuthentication]
+        ):
+            self.client.get(detail_url, format="json")
+            with self.assertNumQueries(1):
+                response = self.client.get(detail_url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], task.id)
+
+
+class TokenBlacklistTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.refresh_url = reverse("v1:token_refresh")
+        self.user = User.objects.create_user(email="rotate@example.com", password="StrongPass123!")
+
+    def rotate(self, refresh: str):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.refresh_url, {"refresh": refresh}, format="json")
+
+    def create_tokens(self, count: int, expires_in: timedelta) -> list[OutstandingToken]:
+        tokens = OutstandingToken.objects.bulk_create(
+            OutstandingToken(
+                user=self.user,
+                jti=f"{expires_in.days}-{index}",
+                token="token",
+                expires_at=aware_utcnow() + expires_in,
+            )
+            for index in range(count)
+        )
+        BlacklistedToken.objects.bulk_create(BlacklistedToken(token=token) for token in tokens)
+        return tokens
+
+    def test_refresh_rotates_and_blacklists_the_old_token(self) -> None:
+        refresh = str(UserClaimsRefreshToken.for_user(self.user))
+
+        response = self.rotate(refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+        self.assertTrue(OutstandingToken.objects.filter(token=response.data["refresh"]).exists())
+        self.assertEqual(self.rotate(refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.rotate(response.data["refresh"]).status_code, status.HTTP_200_OK)
+
+    def test_refresh_rejects_inactive_users(self) -> None:
+        refresh = str(UserClaimsRefreshToken.for_user(self.user))
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertEqual(self.rotate(refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def shared_cache(self):
+        use_shared_cache(self)
+        return override_settings(JWT_BLACKLIST_CACHE=True)
+
+    def test_cached_blacklist_check_skips_the_database(self) -> None:
+        self.enterContext(self.shared_cache())
+        refresh = str(UserClaimsRefreshToken.for_user(self.user))
+        rotated = self.rotate(refresh).data["refresh"]
+
+        with self.assertNumQueries(0):
+            with self.assertRaises(TokenError):
+                UserClaimsRefreshToken(refresh)
+        cache.clear()
+        UserClaimsRefreshToken(rotated)
+        with self.assertNumQueries(0):
+            UserClaimsRefreshToken(rotated)
+        with self.assertRaises(TokenError):
+            UserClaimsRefreshToken(refresh)
+
+    def test_cached_blacklist_survives_evicted_keys(self) -> None:
+        self.enterContext(self.shared_cache())
+        first = str(UserClaimsRefreshToken.for_user(self.user))
+        UserClaimsRefreshToken(first)
+        second = self.rotate(first).data["refresh"]
+        self.rotate(second)
+
+        # Revocations after the filter was built are added to it, so losing their own keys is harmless.
+        jtis = [UserClaimsRefreshToken(token, verify=False)["jti"] for token in (first, second)]
+        cache.delete_many([f"users:token-blacklist:jti:{jti}" for jti in jtis])
+        with self.assertNumQueries(1):
+            with self.assertRaises(TokenError):
+                UserClaimsRefreshToken(second)
+
+        # A lost revocation counter makes the filter untrusted until it is rebuilt from the database.
+        cache.delete(REVOKED_KEY)
+        with self.assertRaises(TokenError):
+            UserClaimsRefreshToken(first)
+
+    @override_settings(JWT_BLACKLIST_CACHE=True)
+    def test_cached_blacklist_refuses_a_per_process_cache(self) -> None:
+        refresh = str(UserClaimsRefreshToken.for_user(self.user))
+        with self.assertRaises(ImproperlyConfigured):
+            UserClaimsRefreshToken(refresh)
+
+    def test_prune_deletes_expired_tokens_in_batches(self) -> None:
+        self.create_tokens(5, timedelta(days=-1))
+        live = self.create_tokens(2, timedelta(days=1))
+
+        self.assertEqual(prune_expired_tokens(batch_size=2), 5)
+        self.assertQuerySetEqual(OutstandingToken.objects.order_by("id"), live)
+        self.assertEqual(BlacklistedToken.objects.count(), 2)
+
+        self.create_tokens(3, timedelta(days=-2))
+        stdout = StringIO()
+        call_command("prune_token_blacklist", batch_size=2, stdout=stdout)
+        self.assertIn("Pruned 3 expired tokens.", stdout.getvalue())
+
+    def test_prune_rebuilds_the_cached_blacklist(self) -> None:
+        self.enterContext(self.shared_cache())
+        expired = self.create_tokens(1, timedelta(days=-1))
+        live = self.create_tokens(1, timedelta(days=1))
+
+        call_command("prune_token_blacklist", stdout=StringIO())
+
+        self.assertFalse(OutstandingToken.objects.filter(id=expired[0].id).exists())
+        self.assertIsNotNone(cache.get(BLOOM_KEY))
+        with self.assertNumQueries(1):
+            self.assertTrue(is_blacklisted(live[0].jti))
+
+    def test_bloom_filter_has_no_false_negatives(self) -> None:
+        bloom = BloomFilter.for_capacity(1000, 0.01)
+        for index in range(1000):
+            bloom.add(f"jti-{index}")
+
+        self.assertTrue(all(f"jti-{index}" in bloom for index in range(1000)))
+        false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+        self.assertLess(false_positives, 300)
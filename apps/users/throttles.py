@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+
+class LoginAttemptThrottle:
+
+    def __init__(self, request, email: str | None):
+        account = hashlib.md5((email or "").strip().lower().encode("utf-8")).hexdigest()
+        ip_address = BaseThrottle().get_ident(request) if request is not None else ""
+        self.account_key = f"users:login-failures:account:{account}"
+        self.ip_key = f"users:login-failures:ip:{ip_address}"
+        self.limits = {
+            self.account_key: settings.LOGIN_MAX_FAILURES_PER_ACCOUNT,
+            self.ip_key: settings.LOGIN_MAX_FAILURES_PER_IP,
+        }
+        self.window = settings.LOGIN_FAILURE_WINDOW_SECONDS
+
+    def check(self) -> None:
+        # Runs before authenticate(), so rejected attempts never reach the password hasher.
+        failures = cache.get_many(list(self.limits))
+        if any(failures.get(key, 0) >= limit for key, limit in self.limits.items()):
+            raise Throttled(wait=self.window, detail="Too many failed login attempts. Try again later.")
+
+    def record_failure(self) -> None:
+        for key in self.limits:
+            if not cache.add(key, 1, self.window):
+                try:
+                    cache.incr(key)
+                except ValueError:
+                    cache.set(key, 1, self.window)
+
+    def reset(self) -> None:
+        cache.delete(self.account_key)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .blacklist import is_blacklisted, remember_blacklisted
+
+
+class UserClaimsRefreshToken(RefreshToken):
+
+    user = None
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.user = user
+        token["email"] = user.email
+        token["name"] = user.get_full_name()
+        token["user_type"] = user.user_type.code if user.user_type_id else None
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        token["token_version"] = user.token_version
+        return token
+
+    def get_user(self):
+        # Loaded once per token; the stock blacklist()/outstand() each query the user again.
+        if self.user is None:
+            user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+            self.user = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        return self.user
+
+    def check_blacklist(self) -> None:
+        if not settings.JWT_BLACKLIST_CACHE:
+            return super().check_blacklist()
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def get_outstanding_fields(self) -> dict:
+        return {
+            "user": self.get_user(),
+            "created_at": self.current_time,
+            "token": str(self),
+            "expires_at": datetime_from_epoch(self.payload["exp"]),
+        }
+
+    def blacklist(self) -> None:
+        jti = self.payload[api_settings.JTI_CLAIM]
+        token = OutstandingToken.objects.filter(jti=jti).first()
+        if token is None:
+            token = OutstandingToken.objects.get_or_create(jti=jti, defaults=self.get_outstanding_fields())[0]
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token)], ignore_conflicts=True)
+        if settings.JWT_BLACKLIST_CACHE:
+            transaction.on_commit(partial(remember_blacklisted, jti))
+
+    def outstand(self) -> None:
+        # A freshly rotated jti cannot exist yet, so skip the get_or_create lookup and savepoint.
+        jti = self.payload[api_settings.JTI_CLAIM]
+        OutstandingToken.objects.bulk_create(
+            [OutstandingToken(jti=jti, **self.get_outstanding_fields())], ignore_conflicts=True
+        )
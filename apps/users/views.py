@@ -1,20 +1,28 @@
 from __future__ import annotations
 
-from drf_spectacular.utils import OpenApiExample, extend_schema
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from .models import User
+from .pagination import UserCursorPagination
 from .serializers import (
     EmailTokenObtainPairSerializer,
     LoginSerializer,
     RegisterSerializer,
     UserSerializer,
 )
+from .tokens import UserClaimsRefreshToken
 
 
 class RegisterAPIView(APIView):
@@ -69,7 +77,7 @@ class LoginAPIView(APIView):
         serializer = LoginSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
-        refresh = RefreshToken.for_user(user)
+        refresh = UserClaimsRefreshToken.for_user(user)
         return Response(
             {
                 "message": "Login successful.",
@@ -84,20 +92,84 @@ class EmailTokenObtainPairView(TokenObtainPairView):
     serializer_class = EmailTokenObtainPairSerializer
 
 
+class CSVEcho:
+
+    def write(self, value: str) -> str:
+        return value
+
+
 class UserDataAPIView(APIView):
     permission_classes = [IsAuthenticated]
+    export_formats = ("ndjson", "csv")
+    export_columns = {
+        field: "user_type__code" if field == "user_type" else field
+        for field in UserSerializer.Meta.fields
+    }
+
+    def get_queryset(self, request):
+        queryset = User.objects.order_by("id")
+        if not request.user.has_global_data_access():
+            queryset = queryset.filter(id=request.user.id)
+        return queryset
 
     @extend_schema(
         tags=["Users"],
-        description="Regular users get their own data; admin and super admin can view all users.",
+        description=(
+            "Regular users get their own data; admin and super admin can view all users. "
+            "Results use cursor pagination; pass `export=ndjson` or `export=csv` to stream "
+            "every row instead."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="cursor",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Pagination cursor taken from the `next`/`previous` links.",
+            ),
+            OpenApiParameter(
+                name="export",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                enum=["ndjson", "csv"],
+                description="Stream all accessible users as NDJSON or CSV.",
+            ),
+        ],
         responses={200: UserSerializer(many=True)},
     )
     def get(self, request, *args, **kwargs):
-        queryset = User.objects.select_related("user_type").all().order_by("id")
-        if not request.user.has_global_data_access():
-            queryset = queryset.filter(id=request.user.id)
-        serializer = UserSerializer(queryset, many=True)
-        return Response(
-            {"count": len(serializer.data), "results": serializer.data},
-            status=status.HTTP_200_OK,
+        queryset = self.get_queryset(request)
+        export_format = request.query_params.get("export")
+        if export_format:
+            return self.export(queryset, export_format)
+
+        paginator = UserCursorPagination()
+        users = paginator.paginate_queryset(queryset.select_related("user_type"), request, view=self)
+        serializer = UserSerializer(users, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def export(self, queryset, export_format: str) -> StreamingHttpResponse:
+        if export_format not in self.export_formats:
+            raise ValidationError({"export": f"Choose one of: {', '.join(self.export_formats)}."})
+
+        fields = list(self.export_columns)
+        # The rows are read after the view returns, so bind the alias chosen for this request now.
+        rows = queryset.using(queryset.db).values_list(*self.export_columns.values()).iterator(
+            chunk_size=getattr(settings, "USER_EXPORT_CHUNK_SIZE", 2000)
         )
+        if export_format == "csv":
+            content = self.stream_csv(csv.writer(CSVEcho()), fields, rows)
+            content_type = "text/csv"
+        else:
+            content = (
+                json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder) + "\n" for row in rows
+            )
+            content_type = "application/x-ndjson"
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="users.{export_format}"'
+        return response
+
+    def stream_csv(self, writer, fields, rows):
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow(row)
@@ -4,5 +4,8 @@ from django.core.asgi import get_asgi_application
 
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+# Async views run each request's queries on a different executor thread, so persistent
+# connections pile up one per thread and are never reused. Close them after each request.
+os.environ["DB_CONN_MAX_AGE"] = "0"
 
 application = get_asgi_application()
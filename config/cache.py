@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+
+PER_PROCESS_CACHES = (LocMemCache, DummyCache)
+
+
+def is_shared_cache() -> bool:
+    # Local memory (and the dummy cache) is private to one worker process, so other workers never see its writes.
+    return not isinstance(caches["default"], PER_PROCESS_CACHES)
+
+
+def get_shared_cache(setting: str):
+    if not is_shared_cache():
+        raise ImproperlyConfigured(f"{setting} needs a cache backend shared by all workers.")
+    return cache
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+PRAGMA_TOKEN = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+
+def get_pragma_statements(pragmas: dict[str, str]) -> list[str]:
+    statements = []
+    for name, value in pragmas.items():
+        if not PRAGMA_TOKEN.match(name) or not PRAGMA_TOKEN.match(str(value)):
+            raise ImproperlyConfigured(f"Invalid SQLite pragma {name}={value!r}.")
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs) -> None:
+    if connection.vendor != "sqlite":
+        return
+    statements = get_pragma_statements(getattr(settings, "SQLITE_PRAGMAS", {}))
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+MAX_LOGGED_QUERIES = 50
+
+
+@dataclass
+class RequestMetrics:
+
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_time: float = 0.0
+    serializer_time: float = 0.0
+    serializer_depth: int = 0
+    sql: list[tuple[str, float]] | None = None
+
+    def record_query(self, sql: str, duration: float) -> None:
+        self.queries += 1
+        self.db_time += duration
+        if self.sql is not None and len(self.sql) < MAX_LOGGED_QUERIES:
+            self.sql.append((sql, duration))
+
+    def server_timing(self, total: float) -> str:
+        return (
+            f"total;dur={total * 1000:.1f}, "
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries", '
+            f"serializer;dur={self.serializer_time * 1000:.1f}"
+        )
+
+
+request_metrics: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(sender, connection, **kwargs) -> None:
+    # Connections are reopened on the same wrapper object, so only add the recorder once.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def serializer_timer():
+    metrics = request_metrics.get()
+    if metrics is None:
+        yield
+        return
+    started, db_time = time.perf_counter(), metrics.db_time
+    metrics.serializer_depth += 1
+    try:
+        yield
+    finally:
+        metrics.serializer_depth -= 1
+        if not metrics.serializer_depth:
+            # Lazy querysets evaluated while serializing are already counted as database time.
+            metrics.serializer_time += time.perf_counter() - started - (metrics.db_time - db_time)
+
+
+class TimedSerializerMixin:
+
+    # Timed per object, so many=True list serializers are covered through their child.
+    def to_representation(self, instance):
+        with serializer_timer():
+            return super().to_representation(instance)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    labels = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+class Counter:
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.lock = threading.Lock()
+        self.series: dict[tuple, float] = {}
+
+    def inc(self, labels: tuple, amount: float = 1) -> None:
+        with self.lock:
+            self.series[labels] = self.series.get(labels, 0) + amount
+
+    def clear(self) -> None:
+        with self.lock:
+            self.series.clear()
+
+    def samples(self):
+        with self.lock:
+            series = dict(self.series)
+        for labels, value in sorted(series.items()):
+            yield f"{self.name}{_format_labels(self.labels, labels)} {value}"
+
+
+class Histogram(Counter):
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...], buckets: tuple[float, ...]):
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+
+    def observe(self, labels: tuple, value: float) -> None:
+        with self.lock:
+            # Per bucket counts (last one is +Inf), then the sum.
+            series = self.series.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def samples(self):
+        with self.lock:
+            series = {labels: list(values) for labels, values in self.series.items()}
+        for labels, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), values[:-1]):
+                cumulative += count
+                bucket_labels = _format_labels(self.labels, labels, f'le="{bound}"')
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, labels)} {values[-1]}"
+            yield f"{self.name}_count{_format_labels(self.labels, labels)} {cumulative}"
+
+
+VIEW_LABELS = ("view", "method")
+
+REQUESTS = Counter("http_requests_total", "Requests by URL name, method and status.", (*VIEW_LABELS, "status"))
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Wall time until the response is returned.", VIEW_LABELS, DURATION_BUCKETS
+)
+DB_QUERIES = Histogram("http_request_db_queries", "Database queries per request.", VIEW_LABELS, QUERY_BUCKETS)
+DB_DURATION = Histogram(
+    "http_request_db_duration_seconds", "Time spent in database queries.", VIEW_LABELS, DURATION_BUCKETS
+)
+SERIALIZER_DURATION = Histogram(
+    "http_request_serializer_duration_seconds", "Time spent building serializer data.", VIEW_LABELS, DURATION_BUCKETS
+)
+RESPONSE_SIZE = Histogram("http_response_size_bytes", "Response body size.", VIEW_LABELS, SIZE_BUCKETS)
+
+METRICS = (REQUESTS, REQUEST_DURATION, DB_QUERIES, DB_DURATION, SERIALIZER_DURATION, RESPONSE_SIZE)
+
+
+def observe_request(view: str, method: str, status: int, metrics: RequestMetrics, total: float, size) -> None:
+    labels = (view, method)
+    REQUESTS.inc((*labels, status))
+    REQUEST_DURATION.observe(labels, total)
+    DB_QUERIES.observe(labels, metrics.queries)
+    DB_DURATION.observe(labels, metrics.db_time)
+    SERIALIZER_DURATION.observe(labels, metrics.serializer_time)
+    if size is not None:
+        RESPONSE_SIZE.observe(labels, size)
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    # Scrapers send the bearer token; without one configured only staff (admin session) may read the metrics.
+    token = getattr(settings, "REQUEST_METRICS_TOKEN", "")
+    if token:
+        if not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return HttpResponse(status=401)
+    elif not request.user.is_staff:
+        return HttpResponse(status=403 if request.user.is_authenticated else 401)
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
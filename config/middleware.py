@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+
+from .metrics import RequestMetrics, observe_request, request_metrics
+from .routers import ReadRouting, pin_to_primary, read_routing
+
+
+logger = logging.getLogger(__name__)
+
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _start_routing(request):
+    return read_routing.set(ReadRouting(request=request, read_only=request.method in SAFE_METHODS))
+
+
+def _finish_routing(request, token) -> None:
+    routing = read_routing.get()
+    read_routing.reset(token)
+    if not routing.read_only and getattr(settings, "DATABASE_REPLICAS", None):
+        user_id = routing.get_user_id()
+        if user_id is not None:
+            pin_to_primary(user_id)
+
+
+@sync_and_async_middleware
+def replica_routing_middleware(get_response):
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            token = _start_routing(request)
+            try:
+                return await get_response(request)
+            finally:
+                _finish_routing(request, token)
+
+    else:
+
+        def middleware(request):
+            token = _start_routing(request)
+            try:
+                return get_response(request)
+            finally:
+                _finish_routing(request, token)
+
+    return middleware
+
+
+def _start_metrics():
+    slow_threshold = getattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 0)
+    return request_metrics.set(RequestMetrics(sql=[] if slow_threshold else None))
+
+
+def _finish_metrics(request, response, token) -> None:
+    metrics = request_metrics.get()
+    request_metrics.reset(token)
+    total = time.perf_counter() - metrics.started
+    match = getattr(request, "resolver_match", None)
+    view = (match.view_name or "unnamed") if match else "unmatched"
+    # Streaming bodies are not read here; only their time to first byte is measured.
+    size = None if response.streaming else len(response.content)
+    observe_request(view, request.method, response.status_code, metrics, total, size)
+    if getattr(settings, "SERVER_TIMING_HEADER", False):
+        response["Server-Timing"] = metrics.server_timing(total)
+
+    slow_threshold = getattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 0)
+    if slow_threshold and total * 1000 >= slow_threshold:
+        queries = "".join(f"\n  {duration * 1000:8.1f} ms  {sql}" for sql, duration in metrics.sql)
+        logger.warning(
+            "Slow request %s %s (%s): %.1f ms, %d queries in %.1f ms, serializer %.1f ms%s",
+            request.method,
+            request.path,
+            view,
+            total * 1000,
+            metrics.queries,
+            metrics.db_time * 1000,
+            metrics.serializer_time * 1000,
+            queries,
+        )
+
+
+@sync_and_async_middleware
+def request_metrics_middleware(get_response):
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            token = _start_metrics()
+            response = await get_response(request)
+            _finish_metrics(request, response, token)
+            return response
+
+    else:
+
+        def middleware(request):
+            token = _start_metrics()
+            response = get_response(request)
+            _finish_metrics(request, response, token)
+            return response
+
+    return middleware
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import random
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import LazyObject
+
+from .cache import get_shared_cache
+
+
+@dataclass
+class ReadRouting:
+
+    request: object
+    read_only: bool
+    alias: str | None = None
+
+    def get_user_id(self) -> int | None:
+        # DRF assigns the authenticated user onto the Django request; until then only the
+        # lazy session user is there, and resolving it here would recurse into the router.
+        user = self.request.__dict__.get("user")
+        if user is None or isinstance(user, LazyObject) or not user.is_authenticated:
+            return None
+        return user.id
+
+    def get_read_alias(self) -> str:
+        if self.alias is not None:
+            return self.alias
+        user_id = self.get_user_id()
+        if not self.read_only or user_id is None:
+            return DEFAULT_DB_ALIAS
+        if is_pinned_to_primary(user_id):
+            self.alias = DEFAULT_DB_ALIAS
+        else:
+            self.alias = random.choice(settings.DATABASE_REPLICAS)
+        return self.alias
+
+
+read_routing: ContextVar[ReadRouting | None] = ContextVar("read_routing", default=None)
+
+
+def _pin_key(user_id: int) -> str:
+    return f"db:primary-pin:{user_id}"
+
+
+def pin_to_primary(user_id: int) -> None:
+    # The next request may land on another worker, which has to see the pin.
+    cache = get_shared_cache("DB_REPLICAS")
+    cache.set(_pin_key(user_id), True, getattr(settings, "DB_REPLICA_PIN_SECONDS", 5))
+
+
+def is_pinned_to_primary(user_id: int) -> bool:
+    return bool(get_shared_cache("DB_REPLICAS").get(_pin_key(user_id)))
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        routing = read_routing.get()
+        if routing is None or not getattr(settings, "DATABASE_REPLICAS", None):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return routing.get_read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in getattr(settings, "DATABASE_REPLICAS", ())
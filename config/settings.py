@@ -49,12 +49,20 @@ INSTALLED_APPS = [
     "apps.tasks",
 ]
 
+# Per-request wall, database and serializer time (Server-Timing header and /metrics)
+REQUEST_METRICS = os.getenv("REQUEST_METRICS", "True").lower() in {"1", "true", "yes"}
+REQUEST_METRICS_TOKEN = os.getenv("REQUEST_METRICS_TOKEN", "")
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "False").lower() in {"1", "true", "yes"}
+SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "0"))
+
 MIDDLEWARE = [
+    *(["config.middleware.request_metrics_middleware"] if REQUEST_METRICS else []),
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "config.middleware.replica_routing_middleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -77,7 +85,34 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
-# ASGI_APPLICATION = "config.asgi.application"
+ASGI_APPLICATION = "config.asgi.application"
+
+
+DB_CONN_MAX_AGE = os.getenv("DB_CONN_MAX_AGE", "60").strip().lower()
+DB_CONN_HEALTH_CHECKS = os.getenv("DB_CONN_HEALTH_CHECKS", "True").lower() in {"1", "true", "yes"}
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+DB_POOL = os.getenv("DB_POOL", "False").lower() in {"1", "true", "yes"}
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+
+DATABASE_CONNECTION = {
+    # Seconds a connection is reused across requests; 0 closes it after each request, "none" keeps it open.
+    "CONN_MAX_AGE": None if DB_CONN_MAX_AGE in {"none", "unlimited"} else int(DB_CONN_MAX_AGE or 0),
+    "CONN_HEALTH_CHECKS": DB_CONN_HEALTH_CHECKS,
+}
+
+
+def _supports_connection_pool() -> bool:
+    import importlib.util
+
+    import django
+
+    return (
+        django.VERSION >= (5, 1)
+        and importlib.util.find_spec("psycopg") is not None
+        and importlib.util.find_spec("psycopg_pool") is not None
+    )
 
 
 if os.getenv("POSTGRES_DB") and os.getenv("POSTGRES_USER") and os.getenv("POSTGRES_PASSWORD"):
@@ -89,17 +124,73 @@ if os.getenv("POSTGRES_DB") and os.getenv("POSTGRES_USER") and os.getenv("POSTGR
             "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
             "HOST": os.getenv("POSTGRES_HOST", "localhost"),
             "PORT": os.getenv("POSTGRES_PORT", "5432"),
+            "OPTIONS": {"connect_timeout": DB_CONNECT_TIMEOUT},
+            **DATABASE_CONNECTION,
         }
     }
+    if DB_POOL and _supports_connection_pool():
+        # The pool owns connection reuse; Django rejects pooling combined with CONN_MAX_AGE.
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": DB_POOL_TIMEOUT,
+        }
 else:
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            **DATABASE_CONNECTION,
         }
     }
 
 
+# Read replicas: PostgreSQL hosts (host or host:port) or SQLite file paths, comma-separated.
+DB_REPLICAS = [value.strip() for value in os.getenv("DB_REPLICAS", "").split(",") if value.strip()]
+DB_REPLICA_PIN_SECONDS = int(os.getenv("DB_REPLICA_PIN_SECONDS", "5"))
+DATABASE_REPLICAS = []
+for _index, _replica in enumerate(DB_REPLICAS):
+    _alias = "replica" if _index == 0 else f"replica_{_index + 1}"
+    if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+        _location = {"NAME": BASE_DIR / _replica}
+    else:
+        _host, _, _port = _replica.partition(":")
+        _location = {"HOST": _host, "PORT": _port or DATABASES["default"]["PORT"]}
+    DATABASES[_alias] = {
+        **DATABASES["default"],
+        **_location,
+        "OPTIONS": dict(DATABASES["default"].get("OPTIONS", {})),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(_alias)
+
+DATABASE_ROUTERS = ["config.routers.PrimaryReplicaRouter"]
+
+
+# Applied to every new SQLite connection by config.database.apply_sqlite_pragmas; empty values are skipped.
+SQLITE_PRAGMAS = {
+    name: value
+    for name, value in (
+        ("journal_mode", os.getenv("SQLITE_JOURNAL_MODE", "WAL")),
+        ("synchronous", os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")),
+        ("busy_timeout", os.getenv("SQLITE_BUSY_TIMEOUT", "5000")),
+        ("mmap_size", os.getenv("SQLITE_MMAP_SIZE", "268435456")),
+        ("cache_size", os.getenv("SQLITE_CACHE_SIZE", "-65536")),
+        ("temp_store", os.getenv("SQLITE_TEMP_STORE", "MEMORY")),
+    )
+    if value.strip()
+}
+
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", ""),
+    }
+}
+
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -116,6 +207,37 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# The preferred hasher is listed first; the others still verify existing hashes, which are
+# upgraded to the preferred hasher and parameters on the next successful login.
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2").strip().lower()
+_PASSWORD_HASHER_CLASSES = {
+    "pbkdf2": "apps.users.hashers.TunedPBKDF2PasswordHasher",
+    "scrypt": "apps.users.hashers.TunedScryptPasswordHasher",
+    "argon2": "apps.users.hashers.TunedArgon2PasswordHasher",
+}
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHER_CLASSES.get(PASSWORD_HASHER, _PASSWORD_HASHER_CLASSES["pbkdf2"]),
+    *(path for name, path in _PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", "720000"))
+SCRYPT_WORK_FACTOR = int(os.getenv("SCRYPT_WORK_FACTOR", "16384"))
+SCRYPT_BLOCK_SIZE = int(os.getenv("SCRYPT_BLOCK_SIZE", "8"))
+SCRYPT_PARALLELISM = int(os.getenv("SCRYPT_PARALLELISM", "1"))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "102400"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "8"))
+
+AUTHENTICATION_BACKENDS = ["apps.users.backends.PooledHashingModelBackend"]
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", "2"))
+PASSWORD_HASHING_MAX_PENDING = int(os.getenv("PASSWORD_HASHING_MAX_PENDING", "32"))
+PASSWORD_HASHING_TIMEOUT = float(os.getenv("PASSWORD_HASHING_TIMEOUT", "10"))
+
+LOGIN_FAILURE_WINDOW_SECONDS = int(os.getenv("LOGIN_FAILURE_WINDOW_SECONDS", "900"))
+LOGIN_MAX_FAILURES_PER_ACCOUNT = int(os.getenv("LOGIN_MAX_FAILURES_PER_ACCOUNT", "5"))
+LOGIN_MAX_FAILURES_PER_IP = int(os.getenv("LOGIN_MAX_FAILURES_PER_IP", "50"))
+
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
 USE_I18N = True
@@ -127,9 +249,16 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "users.User"
 
 
+JWT_STATELESS_AUTH = os.getenv("JWT_STATELESS_AUTH", "False").lower() in {"1", "true", "yes"}
+
+# Reverse proxies in front of the app. With 0 the client IP is REMOTE_ADDR and X-Forwarded-For is ignored.
+NUM_PROXIES = int(os.getenv("NUM_PROXIES", "0"))
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.StatelessJWTAuthentication"
+        if JWT_STATELESS_AUTH
+        else "apps.users.authentication.UserTypeJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -145,17 +274,43 @@ REST_FRAMEWORK = {
     "DEFAULT_VERSION": "v1",
     "ALLOWED_VERSIONS": ("v1",),
     "VERSION_PARAM": "version",
+    "NUM_PROXIES": NUM_PROXIES,
 }
 
 
+USER_EXPORT_CHUNK_SIZE = int(os.getenv("USER_EXPORT_CHUNK_SIZE", "2000"))
+
+TASK_COUNT_STRATEGY = os.getenv("TASK_COUNT_STRATEGY", "exact").strip().lower()
+TASK_COUNT_CACHE_TTL = int(os.getenv("TASK_COUNT_CACHE_TTL", "60"))
+TASK_COUNT_ESTIMATE_THRESHOLD = int(os.getenv("TASK_COUNT_ESTIMATE_THRESHOLD", "1000"))
+TASK_SEARCH_BACKEND = os.getenv("TASK_SEARCH_BACKEND", "auto").strip().lower()
+TASK_ASYNC_VIEWS = os.getenv("TASK_ASYNC_VIEWS", "False").lower() in {"1", "true", "yes"}
+TASK_LIST_CACHE_TTL = int(os.getenv("TASK_LIST_CACHE_TTL", "0"))
+TASK_BULK_MAX_OPERATIONS = int(os.getenv("TASK_BULK_MAX_OPERATIONS", "100"))
+TASK_CHANGES_PAGE_SIZE = int(os.getenv("TASK_CHANGES_PAGE_SIZE", "100"))
+TASK_TOMBSTONE_RETENTION_DAYS = int(os.getenv("TASK_TOMBSTONE_RETENTION_DAYS", "30"))
+TASK_CHANGES_SAFETY_LAG_SECONDS = float(os.getenv("TASK_CHANGES_SAFETY_LAG_SECONDS", "5"))
+TASK_EVENT_BROKER = os.getenv("TASK_EVENT_BROKER", "apps.tasks.events.InMemoryTaskEventBroker")
+TASK_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("TASK_EVENTS_HEARTBEAT_SECONDS", "15"))
+
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=int(os.getenv("JWT_ACCESS_MINUTES", "60"))),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=int(os.getenv("JWT_REFRESH_DAYS", "1"))),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_USER_CLASS": "apps.users.authentication.ClaimsUser",
+    "TOKEN_REFRESH_SERIALIZER": "apps.users.serializers.UserClaimsTokenRefreshSerializer",
 }
 
+# Check refresh tokens against a cached bloom filter of blacklisted jtis instead of the database.
+# Needs a cache shared by every worker process (not LocMemCache) to be safe with several workers.
+JWT_BLACKLIST_CACHE = os.getenv("JWT_BLACKLIST_CACHE", "False").lower() in {"1", "true", "yes"}
+JWT_BLACKLIST_CACHE_TTL = int(os.getenv("JWT_BLACKLIST_CACHE_TTL", "3600"))
+JWT_BLACKLIST_BLOOM_ERROR_RATE = float(os.getenv("JWT_BLACKLIST_BLOOM_ERROR_RATE", "0.001"))
+JWT_BLACKLIST_PRUNE_BATCH_SIZE = int(os.getenv("JWT_BLACKLIST_PRUNE_BATCH_SIZE", "1000"))
+
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Task Manager API",
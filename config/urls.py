@@ -1,8 +1,14 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
+from .metrics import metrics_view
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include(("config.v1_urls", "api"), namespace="v1")),
 ]
+
+if settings.REQUEST_METRICS:
+    urlpatterns.append(path("metrics", metrics_view, name="metrics"))